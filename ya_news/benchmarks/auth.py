@@ -0,0 +1,51 @@
+"""Запросы к БД и время авторизованного запроса с кешем сессий и без."""
+from benchmarks import measure, setup
+
+CONFIGS = (
+    ('сессии и пользователь в БД', {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+        'AUTHENTICATION_BACKENDS': [
+            'django.contrib.auth.backends.ModelBackend',
+        ],
+    }),
+    ('cached_db и пользователь в памяти', {}),
+)
+
+
+def main():
+    setup()
+    from django.contrib.auth import get_user_model
+    from django.test import Client, override_settings
+    from django.urls import reverse
+
+    from news.models import Comment, News
+    from yanews.middleware import QueryStats
+
+    author = get_user_model().objects.create(username='Автор')
+    news = News.objects.create(title='Новость', text='Текст')
+    comment = Comment.objects.create(news=news, author=author, text='Текст')
+    urls = (
+        reverse('news:home'),
+        reverse('news:detail', args=(news.pk,)),
+        reverse('news:edit', args=(comment.pk,)),
+    )
+    print('настройка                          запросов  мс/запрос')
+    for name, overrides in CONFIGS:
+        with override_settings(**overrides):
+            client = Client()
+            client.force_login(author)
+            for url in urls:
+                client.get(url)
+            with QueryStats() as stats:
+                for url in urls:
+                    client.get(url)
+            elapsed = measure(
+                lambda: [client.get(url) for url in urls]
+            ) / len(urls)
+        print(
+            f'{name:<34} {stats.count / len(urls):>8.1f}  {elapsed:>9.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
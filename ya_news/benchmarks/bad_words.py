@@ -0,0 +1,46 @@
+"""Проверка комментария по большому списку запрещённых слов."""
+import random
+
+from benchmarks import measure, setup
+
+WORDS_COUNT = 10_000
+TEXT_SIZE = 64 * 1024
+ALPHABET = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+
+
+def random_word(rnd, min_length=5, max_length=12):
+    length = rnd.randint(min_length, max_length)
+    return ''.join(rnd.choice(ALPHABET) for _ in range(length))
+
+
+def substring_scan(words, text):
+    """Прежний способ: отдельный поиск подстроки для каждого слова."""
+    lowered_text = text.lower()
+    return any(word in lowered_text for word in words)
+
+
+def main():
+    setup()
+    from news.moderation import BadWordsMatcher
+
+    rnd = random.Random(0)
+    words = {random_word(rnd) for _ in range(WORDS_COUNT)}
+    # Слова текста короче запрещённых, совпадений нет: худший случай,
+    # когда проверять приходится весь текст целиком.
+    text = ''
+    while len(text) < TEXT_SIZE:
+        text += random_word(rnd, 2, 4) + ' '
+    matcher = BadWordsMatcher(words)
+    assert substring_scan(words, text) == bool(matcher.search(text))
+
+    build = measure(lambda: BadWordsMatcher(words), repeat=3)
+    naive = measure(lambda: substring_scan(words, text), repeat=3)
+    compiled = measure(lambda: matcher.search(text), repeat=3)
+    print(f'{len(words)} слов, текст {len(text) // 1024} KiB')
+    print(f'построение выражения: {build:.1f} мс')
+    print(f'поиск подстроки для каждого слова: {naive:.1f} мс')
+    print(f'одно выражение по дереву слов: {compiled:.1f} мс')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Стоимость главной страницы при росте числа комментариев к новостям."""
+import tracemalloc
+
+from benchmarks import measure, setup
+
+COMMENTS_PER_NEWS = (0, 10, 100, 1000)
+
+
+def main():
+    setup()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+
+    from news.models import Comment, News
+
+    author = get_user_model().objects.create(username='Автор')
+    news_list = [
+        News.objects.create(title=f'Новость {i}', text='Текст')
+        for i in range(settings.NEWS_COUNT_ON_HOME_PAGE)
+    ]
+    client = Client()
+    url = reverse('news:home')
+    total = 0
+    print('comments/news  queries  peak KiB  ms/request')
+    for comments_per_news in COMMENTS_PER_NEWS:
+        Comment.objects.bulk_create(
+            Comment(news=news, author=author, text='Комментарий ' * 50)
+            for news in news_list
+            for _ in range(comments_per_news - total)
+        )
+        total = comments_per_news
+        with CaptureQueriesContext(connection) as queries:
+            client.get(url)
+        query_count = len(queries)
+        tracemalloc.start()
+        client.get(url)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        elapsed = measure(lambda: client.get(url))
+        print(
+            f'{comments_per_news:>13}  {query_count:>7}  '
+            f'{peak / 1024:>8.0f}  {elapsed:>10.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Нагрузочный тест: одни и те же страницы под WSGI и под ASGI.
+
+Сервер запускается отдельно, на тех же данных и с тем же числом
+процессов, например:
+
+gunicorn yanews.wsgi -w 4 --threads 8 -b 127.0.0.1:8000
+uvicorn yanews.asgi:application --workers 4 --port 8001
+
+и затем:
+
+python -m benchmarks.load_test wsgi=http://127.0.0.1:8000/ \\
+    asgi=http://127.0.0.1:8001/ --connections 1000 --duration 30
+
+Каждое соединение держится открытым (keep-alive) и отправляет запросы
+один за другим, так что под нагрузкой одновременно находится
+--connections запросов.
+"""
+import argparse
+import asyncio
+import resource
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+class Stats:
+    """Время ответов и ошибки одного прогона."""
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.statuses = {}
+
+    def report(self, name, elapsed):
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return f'{name}: ответов нет, ошибок {self.errors}'
+        quantiles = statistics.quantiles(latencies, n=100)
+        return (
+            f'{name}: {len(latencies) / elapsed:.0f} запросов/с, '
+            f'p50 {quantiles[49] * 1000:.0f} мс, '
+            f'p99 {quantiles[98] * 1000:.0f} мс, '
+            f'ошибок {self.errors}, статусы {self.statuses}'
+        )
+
+
+async def read_response(reader):
+    """Статус ответа; тело дочитывается по Content-Length."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('Сервер закрыл соединение.')
+    status = int(status_line.split()[1])
+    length, keep_alive = 0, True
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'connection':
+            keep_alive = value != 'close'
+    await reader.readexactly(length)
+    return status, keep_alive
+
+
+async def client(url, deadline, stats):
+    """Одно соединение, которое отправляет запросы до истечения времени."""
+    parts = urlsplit(url)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+    request = (
+        f'GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n\r\n'
+    ).encode()
+    writer = None
+    while time.monotonic() < deadline:
+        started = time.monotonic()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(
+                    parts.hostname, parts.port or 80
+                )
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive = await read_response(reader)
+        except (OSError, ValueError, asyncio.IncompleteReadError):
+            stats.errors += 1
+            if writer is not None:
+                writer.close()
+            writer = None
+            await asyncio.sleep(0.1)
+            continue
+        stats.latencies.append(time.monotonic() - started)
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+        if not keep_alive:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def run(url, connections, duration):
+    stats = Stats()
+    deadline = time.monotonic() + duration
+    started = time.monotonic()
+    await asyncio.gather(
+        *(client(url, deadline, stats) for _ in range(connections))
+    )
+    return stats, time.monotonic() - started
+
+
+def raise_open_files_limit(connections):
+    """Каждому соединению нужен дескриптор файла."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = connections + 64
+    if soft < wanted and (hard == resource.RLIM_INFINITY or hard >= wanted):
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        'targets', nargs='+', metavar='ИМЯ=URL',
+        help='Развёртывания для сравнения, например asgi=http://...',
+    )
+    parser.add_argument('--connections', type=int, default=1000)
+    parser.add_argument('--duration', type=float, default=30)
+    args = parser.parse_args()
+    raise_open_files_limit(args.connections)
+    for target in args.targets:
+        name, _, url = target.partition('=')
+        stats, elapsed = asyncio.run(
+            run(url, args.connections, args.duration)
+        )
+        print(stats.report(name, elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Запросы в секунду к главной и странице новости без кеша и с кешем."""
+import time
+
+from benchmarks import setup
+
+NEWS_COUNT = 10
+COMMENTS_PER_NEWS = 50
+DURATION = 2
+
+CACHE_BACKENDS = {
+    'без кеша': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+    'locmem': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    # Общий для процессов кеш из настроек проекта.
+    'файлы': None,
+}
+
+
+def requests_per_second(client, url):
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < DURATION:
+        client.get(url)
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    setup()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.test import Client, override_settings
+    from django.urls import reverse
+
+    from news.models import Comment, News
+
+    author = get_user_model().objects.create(username='Автор')
+    news_list = [
+        News.objects.create(title=f'Новость {i}', text='Текст ' * 100)
+        for i in range(NEWS_COUNT)
+    ]
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text='Комментарий ' * 20)
+        for news in news_list
+        for _ in range(COMMENTS_PER_NEWS)
+    )
+    urls = {
+        'главная': reverse('news:home'),
+        'новость': reverse('news:detail', args=(news_list[0].pk,)),
+    }
+    client = Client()
+    for backend_name, backend in CACHE_BACKENDS.items():
+        caches = {'default': backend or settings.CACHES['default']}
+        with override_settings(CACHES=caches):
+            for page, url in urls.items():
+                rps = requests_per_second(client, url)
+                print(f'{backend_name:>9}  {page}: {rps:.0f} запросов/с')
+
+
+if __name__ == '__main__':
+    main()
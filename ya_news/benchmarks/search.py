@@ -0,0 +1,74 @@
+"""
+Поиск по комментариям: индекс FTS5 против icontains.
+
+python -m benchmarks.search --comments 1000000
+"""
+import argparse
+import random
+import time
+
+from benchmarks import measure, setup
+
+NEWS_COUNT = 1000
+BATCH_SIZE = 10_000
+ALPHABET = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+
+
+def random_word(rnd):
+    return ''.join(rnd.choice(ALPHABET) for _ in range(rnd.randint(3, 9)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--comments', type=int, default=1_000_000)
+    args = parser.parse_args()
+    setup()
+    from django.contrib.auth import get_user_model
+
+    from news.models import Comment, News
+    from news.search import SearchPage
+
+    rnd = random.Random(0)
+    vocabulary = [random_word(rnd) for _ in range(50_000)]
+    author = get_user_model().objects.create(username='Автор')
+    News.objects.bulk_create(
+        News(
+            title=f'Новость {i}',
+            text=' '.join(rnd.choices(vocabulary, k=50)),
+        )
+        for i in range(NEWS_COUNT)
+    )
+    news_ids = list(News.objects.values_list('pk', flat=True))
+    started = time.perf_counter()
+    for offset in range(0, args.comments, BATCH_SIZE):
+        Comment.objects.bulk_create(
+            Comment(
+                news_id=rnd.choice(news_ids),
+                author=author,
+                text=' '.join(rnd.choices(vocabulary, k=20)),
+            )
+            for _ in range(min(BATCH_SIZE, args.comments - offset))
+        )
+    print(
+        f'{args.comments} комментариев загружено с индексом за '
+        f'{time.perf_counter() - started:.0f} с'
+    )
+
+    for word in (vocabulary[-1], vocabulary[0]):
+        def icontains():
+            return list(
+                News.objects.filter(
+                    comment__text__icontains=word
+                ).distinct().order_by('pk')[:10]
+            )
+
+        def fts():
+            return SearchPage(word).object_list
+
+        print(f'слово {word!r}:')
+        print(f'  icontains: {measure(icontains, repeat=3):.1f} мс')
+        print(f'  FTS5: {measure(fts, repeat=3):.1f} мс')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Время разбора и рендеринга шаблонов с кешированным загрузчиком и без.
+
+Разбор - чтение и компиляция шаблона без родительских и включаемых
+шаблонов, их загрузчик без кеша повторяет при каждом рендеринге.
+Контекст берётся из представлений, кеш фрагментов отключён, чтобы
+рендеринг не подменялся чтением готового HTML из кеша.
+"""
+from benchmarks import measure, setup
+
+NEWS_COUNT = 10
+COMMENTS_COUNT = 50
+LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def backend(loaders):
+    from django.conf import settings
+    from django.template.backends.django import DjangoTemplates
+
+    options = settings.TEMPLATES[0]
+    return DjangoTemplates({
+        'NAME': 'benchmark',
+        'DIRS': options['DIRS'],
+        'APP_DIRS': False,
+        'OPTIONS': {**options['OPTIONS'], 'loaders': loaders},
+    })
+
+
+def main():
+    setup()
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import AnonymousUser
+    from django.test import RequestFactory, override_settings
+
+    from news.models import Comment, News
+    from news.views import NewsDetail, NewsList
+
+    author = get_user_model().objects.create(username='Автор')
+    news_list = News.objects.bulk_create(
+        News(title=f'Новость {i}', text='Текст ' * 100)
+        for i in range(NEWS_COUNT)
+    )
+    news = News.objects.first()
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text='Комментарий ' * 20)
+        for _ in range(COMMENTS_COUNT)
+    )
+    pages = (
+        ('news/home.html', NewsList.as_view(), {}),
+        ('news/detail.html', NewsDetail.as_view(), {'pk': news.pk}),
+    )
+    plain = backend(LOADERS)
+    cached = backend([('django.template.loaders.cached.Loader', LOADERS)])
+    dummy = {'default': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    }}
+    print(f'{len(news_list)} новостей, {COMMENTS_COUNT} комментариев')
+    print('шаблон             разбор, мс  без кеша, мс  с кешем, мс')
+    with override_settings(CACHES=dummy):
+        for name, view, kwargs in pages:
+            request = RequestFactory().get('/')
+            request.user = AnonymousUser()
+            context = view(request, **kwargs).context_data
+            # Первый рендеринг выполняет запросы к БД и загружает
+            # шаблоны в кеш загрузчика.
+            cached.get_template(name).render(context, request)
+            compiled = cached.get_template(name)
+            parsing = measure(lambda: plain.get_template(name), 200)
+            uncached = measure(
+                lambda: plain.get_template(name).render(context, request),
+                200,
+            )
+            rendering = measure(
+                lambda: compiled.render(context, request), 200
+            )
+            print(
+                f'{name:<18} {parsing:>10.3f}  {uncached:>12.3f}  '
+                f'{rendering:>11.3f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
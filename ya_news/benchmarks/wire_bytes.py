@@ -0,0 +1,61 @@
+"""
+Байты ответа главной и страницы новости без сжатия и со сжатием.
+
+Считаются строка статуса, заголовки и тело, как они уходят в сеть.
+"""
+from benchmarks import setup
+
+NEWS_COUNT = 10
+COMMENTS_COUNT = 50
+
+
+def wire_size(response):
+    content = b''.join(response) if response.streaming else response.content
+    status_line = f'HTTP/1.1 {response.status_code} {response.reason_phrase}'
+    return len(status_line) + 2 + len(response.serialize_headers()) + 4 + (
+        len(content)
+    )
+
+
+def main():
+    setup()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.test import Client, override_settings
+    from django.urls import reverse
+
+    from news.models import Comment, News
+
+    author = get_user_model().objects.create(username='Автор')
+    news_list = [
+        News.objects.create(title=f'Новость {i}', text='Текст новости ' * 50)
+        for i in range(NEWS_COUNT)
+    ]
+    Comment.objects.bulk_create(
+        Comment(news=news_list[0], author=author, text='Комментарий ' * 10)
+        for _ in range(COMMENTS_COUNT)
+    )
+    pages = {
+        'главная': reverse('news:home'),
+        'новость': reverse('news:detail', args=(news_list[0].pk,)),
+    }
+    middleware = ['yanews.middleware.CompressionMiddleware']
+    middleware += [
+        name for name in settings.MIDDLEWARE if name != middleware[0]
+    ]
+    print('страница   без сжатия   gzip   доля')
+    with override_settings(MIDDLEWARE=middleware):
+        client = Client()
+        for page, url in pages.items():
+            plain = wire_size(client.get(url))
+            compressed = wire_size(
+                client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+            )
+            print(
+                f'{page:<9} {plain:>11} {compressed:>6} '
+                f'{compressed / plain:>6.0%}'
+            )
+
+
+if __name__ == '__main__':
+    main()
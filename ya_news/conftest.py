@@ -2,9 +2,30 @@ from datetime import datetime, timedelta
 
 import pytest
 from django.conf import settings
+from django.core.cache import caches
+from django.test import override_settings
 from django.utils import timezone
 
 from news.models import Comment, News
+from news.moderation import bad_words
+
+
+@pytest.fixture(scope='session', autouse=True)
+def shared_cache(tmp_path_factory):
+    """Тесты работают с файловым кешем в своём каталоге."""
+    location = tmp_path_factory.mktemp('cache')
+    with override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(location),
+    }}):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Кеш, как и данные в БД, не переживает тест."""
+    caches['default'].clear()
+    bad_words.invalidate()
 
 
 @pytest.fixture
@@ -60,6 +81,12 @@ def news_list():
     return news_list
 
 
+@pytest.fixture
+def saved_news(news_list):
+    """Новости из bulk_create без id, поэтому читаем их из БД."""
+    return list(News.objects.order_by('pk'))
+
+
 @pytest.fixture
 def comment_list(news, author):
     for i in range(3):
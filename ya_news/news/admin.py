@@ -1,15 +1,88 @@
 from django.contrib import admin
+from django.urls import reverse
+from django.utils.html import format_html
 
-from .models import Comment, News
-
-
-class CommentInline(admin.StackedInline):
-    model = Comment
-    extra = 0
+from .models import BadWord, Comment, News, NewsStats
+from .moderation import moderate_comments
 
 
 @admin.register(News)
 class NewsAdmin(admin.ModelAdmin):
-    inlines = [
-        CommentInline,
-    ]
+    """
+    Новости без формы комментариев на странице.
+
+    Комментарии открываются ссылкой в отфильтрованном по новости
+    постраничном списке CommentAdmin, число берётся из NewsStats.
+    """
+    list_display = ('title', 'date', 'comments')
+    list_select_related = ('stats',)
+    readonly_fields = ('comments',)
+    show_full_result_count = False
+
+    @admin.display(description='Комментарии')
+    def comments(self, obj):
+        if obj.pk is None:
+            return '-'
+        try:
+            count = obj.stats.comment_count
+        except NewsStats.DoesNotExist:
+            count = 'открыть'
+        url = reverse('admin:news_comment_changelist')
+        return format_html(
+            '<a href="{}?news__id__exact={}">{}</a>', url, obj.pk, count
+        )
+
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'news', 'author', 'created', 'is_hidden')
+    list_select_related = ('news', 'author')
+    list_filter = ('is_hidden',)
+    raw_id_fields = ('news', 'author')
+    # Поиск по точному имени автора, см. get_search_results.
+    search_fields = ('author__username',)
+    # Последние комментарии первыми, сортировка по первичному ключу.
+    ordering = ('-id',)
+    show_full_result_count = False
+    actions = ('hide_comments', 'delete_comments')
+
+    def get_actions(self, request):
+        # Стандартное удаление отправляет сигналы для каждой строки.
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Комментарии автора с точно таким именем.
+
+        Точное сравнение идёт по уникальному индексу имени пользователя.
+        Стандартный поиск, даже '=author__username', сравнивает без учёта
+        регистра: SQLite выполняет его через LIKE и просматривает всех
+        пользователей.
+        """
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        return queryset.filter(author__username=search_term), False
+
+    def moderate(self, request, queryset, action):
+        result = moderate_comments(queryset, action)
+        self.message_user(request, str(result))
+
+    @admin.action(
+        description='Скрыть выбранные комментарии',
+        permissions=('change',),
+    )
+    def hide_comments(self, request, queryset):
+        self.moderate(request, queryset, 'hide')
+
+    @admin.action(
+        description='Удалить выбранные комментарии без сигналов',
+        permissions=('delete',),
+    )
+    def delete_comments(self, request, queryset):
+        self.moderate(request, queryset, 'delete')
+
+
+admin.site.register(BadWord)
@@ -1,7 +1,29 @@
 from django.apps import AppConfig
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_out
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
 
 
 class NewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'news'
     verbose_name = 'Новости'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from yanews.auth import invalidate_user
+        from yanews.db import apply_sqlite_pragmas
+
+        connection_created.connect(
+            apply_sqlite_pragmas, dispatch_uid='apply_sqlite_pragmas'
+        )
+        for signal in (post_save, post_delete):
+            signal.connect(
+                invalidate_user,
+                sender=get_user_model(),
+                dispatch_uid='invalidate_user',
+            )
+        user_logged_out.connect(
+            invalidate_user, dispatch_uid='invalidate_user'
+        )
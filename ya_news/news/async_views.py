@@ -0,0 +1,141 @@
+"""
+Асинхронные версии страниц чтения для развёртывания через ASGI.
+
+Логика страниц та же, что в news.views. Запросы к БД, кеш и рендеринг
+шаблонов выполняются в ограниченном пуле потоков, поэтому цикл событий
+не блокируется, а число одновременных обращений к БД не растёт вместе
+с числом соединений. Там, где есть асинхронный ORM (Django 4.1+),
+новость загружается без перехода в пул.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import QuerySet
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
+from django.utils.http import quote_etag
+from django.views import generic
+
+from . import views
+from .models import News
+
+ASYNC_ORM = hasattr(QuerySet, 'aget')
+
+executor = ThreadPoolExecutor(
+    max_workers=settings.NEWS_ASYNC_THREADS,
+    thread_name_prefix='news-async',
+)
+
+
+def in_pool(func):
+    """
+    Асинхронная обёртка для синхронного кода, выполняемого в пуле потоков.
+
+    Соединения с БД в потоках пула закрываются по тем же правилам,
+    что и в конце обычного запроса.
+    """
+    def call(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return sync_to_async(call, thread_sensitive=False, executor=executor)
+
+
+def render_view(view, request, *args, **kwargs):
+    """Ответ синхронного представления вместе с рендерингом шаблона."""
+    response = view(request, *args, **kwargs)
+    if callable(getattr(response, 'render', None)):
+        response.render()
+    return response
+
+
+def async_condition(etag_func):
+    """
+    Асинхронный аналог django.views.decorators.http.condition.
+
+    Страницы новостей проверяются только по ETag (см.
+    views.news_detail_etag), он вычисляется в пуле потоков.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def inner(request, *args, **kwargs):
+            etag = await in_pool(etag_func)(request, *args, **kwargs)
+            etag = quote_etag(etag) if etag is not None else None
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = await func(request, *args, **kwargs)
+            if request.method in ('GET', 'HEAD') and etag:
+                response.headers.setdefault('ETag', etag)
+            return response
+        return inner
+    return decorator
+
+
+class AsyncViewMixin:
+    """
+    Асинхронный GET поверх синхронного представления.
+
+    Ставится перед синхронным представлением: тот же GET выполняется
+    в пуле потоков вместе с рендерингом шаблона.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # С Django 4.1 View сам помечает представления с async-обработчиками.
+        if not hasattr(generic.View, 'view_is_async'):
+            markcoroutinefunction(view)
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        """Обход условий синхронного dispatch, ответ 405 тоже ожидается."""
+        response = generic.View.dispatch(self, request, *args, **kwargs)
+        if asyncio.iscoroutine(response):
+            response = await response
+        return response
+
+    async def get(self, request, *args, **kwargs):
+        return await in_pool(render_view)(
+            super().get, request, *args, **kwargs
+        )
+
+
+@method_decorator(
+    async_condition(etag_func=views.news_list_etag), name='get'
+)
+class AsyncNewsList(AsyncViewMixin, views.NewsList):
+    """Асинхронный список новостей."""
+
+
+@method_decorator(
+    async_condition(etag_func=views.news_detail_etag), name='get'
+)
+class AsyncNewsDetail(AsyncViewMixin, views.NewsDetail):
+    """Асинхронная страница новости, комментарий отправляется на неё же."""
+
+    async def get(self, request, *args, **kwargs):
+        if ASYNC_ORM:
+            try:
+                self.object = await self.get_queryset().aget(
+                    pk=self.kwargs['pk']
+                )
+            except News.DoesNotExist:
+                raise Http404('Новость не найдена.')
+        return await super().get(request, *args, **kwargs)
+
+    def get_object(self, queryset=None):
+        if ASYNC_ORM:
+            return self.object
+        return super().get_object(queryset)
+
+    async def post(self, request, *args, **kwargs):
+        return await in_pool(render_view)(
+            views.NewsComment.as_view(), request, *args, **kwargs
+        )
@@ -0,0 +1,19 @@
+"""Версии данных для кеша страниц и списков."""
+from yanews.versions import bump_version, get_version
+
+HOME_VERSION_KEY = 'news:home:version'
+NEWS_VERSION_KEY = 'news:{pk}:version'
+
+
+def home_version():
+    return get_version(HOME_VERSION_KEY)
+
+
+def news_version(pk):
+    return get_version(NEWS_VERSION_KEY.format(pk=pk))
+
+
+def bump_news_version(pk):
+    """Новость или её комментарии изменились, главная тоже устарела."""
+    bump_version(NEWS_VERSION_KEY.format(pk=pk))
+    bump_version(HOME_VERSION_KEY)
@@ -0,0 +1,111 @@
+"""
+Выгрузка новостей и комментариев в NDJSON или CSV.
+
+Строки читаются из БД порциями по первичному ключу, как страницы
+комментариев: каждая порция - отдельный короткий запрос по индексу,
+поэтому ни курсор, ни транзакция чтения не держатся открытыми всю
+выгрузку, а память не зависит от числа строк.
+
+Инкрементальная выгрузка (since) только дописывает: водяной знак - id
+строки, поэтому она отдаёт новые строки, но не повторяет исправленные,
+скрытые и удалённые после прошлой выгрузки. Чтобы получить их текущее
+состояние, нужна полная выгрузка.
+
+Скрытые модерацией комментарии выгружаются вместе с остальными,
+отличить их можно по полю is_hidden.
+"""
+import csv
+import io
+import json
+import zlib
+
+from django.conf import settings
+
+from .models import Comment, News
+
+# Тип выгрузки: (модель, выгружаемые поля).
+EXPORTS = {
+    'news': (News, ('id', 'title', 'text', 'date')),
+    'comments': (
+        Comment,
+        ('id', 'news_id', 'author_id', 'text', 'created', 'is_hidden'),
+    ),
+}
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+GZIP_CONTENT_TYPE = 'application/gzip'
+
+
+def iter_chunks(kind, since=None, chunk_size=None):
+    """
+    Порции строк выгрузки с id больше since, по возрастанию id.
+
+    id последней полученной строки - водяной знак для следующей
+    инкрементальной выгрузки; изменения уже выгруженных строк она
+    не отдаёт.
+    """
+    model, fields = EXPORTS[kind]
+    chunk_size = chunk_size or settings.NEWS_EXPORT_CHUNK_SIZE
+    queryset = model.objects.order_by('pk').values_list(*fields)
+    last_pk = since or 0
+    while True:
+        chunk = list(queryset.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1][0]
+
+
+def serialize(value):
+    """Даты в формате ISO 8601, остальное как есть."""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def export_lines(kind, fmt, since=None, chunk_size=None):
+    """Текст выгрузки, по одному фрагменту на порцию строк."""
+    chunks = iter_chunks(kind, since, chunk_size)
+    _, fields = EXPORTS[kind]
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        yield buffer.getvalue()
+    for chunk in chunks:
+        rows = ([serialize(value) for value in row] for row in chunk)
+        if fmt == 'csv':
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(rows)
+            yield buffer.getvalue()
+        else:
+            yield ''.join(
+                json.dumps(dict(zip(fields, row)), ensure_ascii=False) + '\n'
+                for row in rows
+            )
+
+
+def gzip_stream(fragments):
+    """
+    Сжимает поток фрагментов в gzip на лету.
+
+    После каждого фрагмента данные сбрасываются, чтобы получатель
+    мог распаковывать выгрузку, не дожидаясь её конца.
+    """
+    compressor = zlib.compressobj(wbits=31)
+    for fragment in fragments:
+        yield (
+            compressor.compress(fragment.encode())
+            + compressor.flush(zlib.Z_SYNC_FLUSH)
+        )
+    yield compressor.flush()
+
+
+def export_stream(kind, fmt, since=None, gzip=False, chunk_size=None):
+    """Байты выгрузки, при необходимости сжатые."""
+    fragments = export_lines(kind, fmt, since, chunk_size)
+    if gzip:
+        return gzip_stream(fragments)
+    return (fragment.encode() for fragment in fragments)
@@ -0,0 +1,46 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from news.export import CONTENT_TYPES, EXPORTS, export_stream
+
+
+class Command(BaseCommand):
+    help = 'Выгружает новости или комментарии в NDJSON или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type', choices=tuple(EXPORTS), default='news',
+        )
+        parser.add_argument(
+            '--format', choices=tuple(CONTENT_TYPES), default='ndjson',
+        )
+        parser.add_argument(
+            '--since', type=int, default=0,
+            help=(
+                'Выгрузить только новые строки: с id больше указанного.'
+            ),
+        )
+        parser.add_argument(
+            '--gzip', action='store_true', help='Сжать выгрузку в gzip.',
+        )
+        parser.add_argument(
+            '--output', default='-', help='Путь к файлу или - для stdout.',
+        )
+
+    def handle(self, *args, **options):
+        stream = export_stream(
+            options['type'], options['format'], options['since'],
+            options['gzip'],
+        )
+        if options['output'] == '-':
+            self.write(stream, sys.stdout.buffer)
+            return
+        with open(options['output'], 'wb') as output:
+            self.write(stream, output)
+
+    def write(self, stream, output):
+        """Каждая порция сразу уходит получателю."""
+        for data in stream:
+            output.write(data)
+            output.flush()
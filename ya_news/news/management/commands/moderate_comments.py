@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from news.moderation import moderate_comments, select_comments
+
+
+def datetime_argument(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(value)
+    return parsed
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет или скрывает комментарии автора, за период или '
+        'с запрещёнными словами пачками в коротких транзакциях.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--action', choices=('delete', 'hide'), default='hide',
+        )
+        parser.add_argument('--author', help='Имя пользователя автора.')
+        parser.add_argument(
+            '--since', type=datetime_argument,
+            help='Созданные не раньше, ISO 8601.',
+        )
+        parser.add_argument(
+            '--until', type=datetime_argument,
+            help='Созданные раньше, ISO 8601.',
+        )
+        parser.add_argument(
+            '--bad-words', action='store_true',
+            help=(
+                'С запрещёнными словами. Проверяется каждый комментарий, '
+                'прошедший остальные фильтры.'
+            ),
+        )
+        parser.add_argument(
+            '--batch-size', type=int,
+            help='Комментариев в одной транзакции, по умолчанию '
+                 'COMMENTS_MODERATION_BATCH_SIZE.',
+        )
+
+    def handle(self, *args, **options):
+        filters = ('author', 'since', 'until', 'bad_words')
+        if not any(options[name] for name in filters):
+            raise CommandError(
+                'Укажите хотя бы один из фильтров: '
+                '--author, --since, --until, --bad-words.'
+            )
+        author = None
+        if options['author']:
+            try:
+                author = get_user_model().objects.get_by_natural_key(
+                    options['author']
+                )
+            except get_user_model().DoesNotExist:
+                raise CommandError(
+                    f'Пользователь {options["author"]} не найден.'
+                )
+        queryset = select_comments(
+            author=author,
+            since=options['since'],
+            until=options['until'],
+            bad_words=options['bad_words'],
+        )
+        result = moderate_comments(
+            queryset, options['action'], options['batch_size']
+        )
+        self.stdout.write(str(result))
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from news.stats import rebuild_all
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает статистику комментариев всех новостей пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            help='Новостей в одной пачке, по умолчанию '
+                 'NEWS_STATS_BATCH_SIZE.',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        total = 0
+        for count in rebuild_all(options['batch_size']):
+            total += count
+            self.stdout.write(f'Пересчитано новостей: {total}')
+        self.stdout.write(
+            f'Готово за {time.perf_counter() - started:.1f} с.'
+        )
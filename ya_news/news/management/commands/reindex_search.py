@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from news.search import reindex
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает индекс полнотекстового поиска.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', help='Псевдоним БД.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        for index, count in reindex(options['database']):
+            self.stdout.write(f'{index}: {count}')
+        self.stdout.write(
+            f'Готово за {time.perf_counter() - started:.1f} с.'
+        )
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.15 on 2026-10-18 20:03
+
+from django.db import migrations, models
+
+INITIAL_BAD_WORDS = (
+    'редиска',
+    'негодяй',
+)
+
+
+def add_initial_bad_words(apps, schema_editor):
+    BadWord = apps.get_model('news', 'BadWord')
+    BadWord.objects.using(schema_editor.connection.alias).bulk_create(
+        BadWord(word=word) for word in INITIAL_BAD_WORDS
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BadWord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word', models.CharField(max_length=100, unique=True, verbose_name='Слово')),
+            ],
+            options={
+                'verbose_name': 'Запрещённое слово',
+                'verbose_name_plural': 'Запрещённые слова',
+            },
+        ),
+        migrations.RunPython(
+            add_initial_bad_words, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 3.2.15 on 2026-10-18 20:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_news_stats(apps, schema_editor):
+    """Статистика для уже существующих новостей."""
+    db_alias = schema_editor.connection.alias
+    News = apps.get_model('news', 'News')
+    Comment = apps.get_model('news', 'Comment')
+    NewsStats = apps.get_model('news', 'NewsStats')
+    rows = Comment.objects.using(db_alias).order_by().values(
+        'news_id'
+    ).annotate(
+        comment_count=models.Count('pk'),
+        last_comment_at=models.Max('created'),
+        distinct_authors=models.Count('author', distinct=True),
+    )
+    stats = {row.pop('news_id'): row for row in rows}
+    NewsStats.objects.using(db_alias).bulk_create(
+        NewsStats(news_id=pk, **stats.get(pk, {}))
+        for pk in News.objects.using(db_alias).values_list('pk', flat=True)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_badword'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsStats',
+            fields=[
+                ('news', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='news.news')),
+                ('comment_count', models.PositiveIntegerField(default=0)),
+                ('last_comment_at', models.DateTimeField(blank=True, null=True)),
+                ('distinct_authors', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Статистика новости',
+                'verbose_name_plural': 'Статистика новостей',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='newsstats',
+            index=models.Index(fields=['-comment_count', '-news'], name='newsstats_discussed_idx'),
+        ),
+        migrations.RunPython(fill_news_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.15 on 2026-10-18 20:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_newsstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='is_hidden',
+            field=models.BooleanField(default=False, help_text='Скрытый комментарий не показывается и не учитывается.', verbose_name='Скрыт'),
+        ),
+    ]
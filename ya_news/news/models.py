@@ -11,6 +11,9 @@ class News(models.Model):
 
     class Meta:
         ordering = ('-date',)
+        indexes = (
+            models.Index(fields=('-date', 'id'), name='news_date_id_idx'),
+        )
         verbose_name_plural = 'Новости'
         verbose_name = 'Новость'
 
@@ -29,9 +32,66 @@ class Comment(models.Model):
     )
     text = models.TextField()
     created = models.DateTimeField(auto_now_add=True)
+    is_hidden = models.BooleanField(
+        'Скрыт',
+        default=False,
+        help_text='Скрытый комментарий не показывается и не учитывается.',
+    )
 
     class Meta:
         ordering = ('created',)
+        indexes = (
+            models.Index(
+                fields=('news', 'created', 'id'),
+                name='comment_news_created_idx',
+            ),
+            models.Index(
+                fields=('author', 'id'),
+                name='comment_author_id_idx',
+            ),
+        )
 
     def __str__(self):
         return self.text[:50]
+
+
+class NewsStats(models.Model):
+    """
+    Статистика комментариев новости.
+
+    Обновляется сигналами комментариев, см. news.stats; пересчитывается
+    командой rebuild_news_stats.
+    """
+    news = models.OneToOneField(
+        News,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+    )
+    comment_count = models.PositiveIntegerField(default=0)
+    last_comment_at = models.DateTimeField(null=True, blank=True)
+    distinct_authors = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=('-comment_count', '-news'),
+                name='newsstats_discussed_idx',
+            ),
+        )
+        verbose_name_plural = 'Статистика новостей'
+        verbose_name = 'Статистика новости'
+
+    def __str__(self):
+        return str(self.news_id)
+
+
+class BadWord(models.Model):
+    word = models.CharField('Слово', max_length=100, unique=True)
+
+    class Meta:
+        verbose_name_plural = 'Запрещённые слова'
+        verbose_name = 'Запрещённое слово'
+
+    def __str__(self):
+        return self.word
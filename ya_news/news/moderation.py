@@ -0,0 +1,220 @@
+"""Поиск запрещённых слов и массовая модерация комментариев."""
+import re
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from .caching import bump_news_version, bump_version, get_version
+from .models import BadWord, Comment
+from .stats import rebuild_stats
+
+VERSION_KEY = 'news:bad_words:version'
+
+
+def _trie_to_regex(node):
+    """Регулярное выражение для поддерева префиксного дерева слов."""
+    if '' in node:
+        # Слово закончилось: продолжения уже не влияют на совпадение.
+        return ''
+    leaves = [char for char, child in node.items() if '' in child]
+    branches = [
+        re.escape(char) + _trie_to_regex(child)
+        for char, child in sorted(node.items()) if '' not in child
+    ]
+    if len(leaves) == 1:
+        branches.append(re.escape(leaves[0]))
+    elif leaves:
+        branches.append('[' + ''.join(map(re.escape, sorted(leaves))) + ']')
+    if len(branches) == 1:
+        return branches[0]
+    return '(?:' + '|'.join(branches) + ')'
+
+
+def build_pattern(words):
+    """
+    Собирает одно регулярное выражение для всех слов.
+
+    Слова с общим началом объединяются в префиксное дерево, поэтому
+    в каждой позиции текста проверяется не весь список слов, а только
+    ветви, совпадающие с очередными символами.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    if not trie:
+        return None
+    return re.compile(_trie_to_regex(trie))
+
+
+class BadWordsMatcher:
+    """Проверяет текст на запрещённые слова за один проход."""
+
+    def __init__(self, words=()):
+        self.reload(words)
+
+    def reload(self, words):
+        """Перестраивает выражение под новый список слов."""
+        self.pattern = build_pattern(
+            {word.lower() for word in words if word}
+        )
+
+    def search(self, text):
+        """Возвращает первое найденное запрещённое слово или None."""
+        if self.pattern is None:
+            return None
+        match = self.pattern.search(text.lower())
+        return match.group() if match else None
+
+
+class BadWordsList:
+    """
+    Список запрещённых слов из БД, скомпилированный в памяти процесса.
+
+    Версия списка хранится в кеше Django и сверяется не чаще, чем раз
+    в BAD_WORDS_CHECK_INTERVAL секунд. Слова читаются из БД, только когда
+    версия изменилась, поэтому проверка комментария в БД не ходит.
+
+    Другие процессы узнают о новой версии, только если кеш у них общий
+    (см. CACHES в настройках): с кешем в памяти процесса новые слова
+    до перезапуска действовали бы лишь в процессе, изменившем список.
+    """
+
+    def __init__(self):
+        self.matcher = BadWordsMatcher()
+        self.version = None
+        self.checked_at = None
+
+    def search(self, text):
+        self.refresh()
+        return self.matcher.search(text)
+
+    def refresh(self):
+        now = time.monotonic()
+        if (
+            self.checked_at is not None
+            and now - self.checked_at < settings.BAD_WORDS_CHECK_INTERVAL
+        ):
+            return
+        version = get_version(VERSION_KEY)
+        if version != self.version:
+            self.matcher.reload(
+                BadWord.objects.values_list('word', flat=True)
+            )
+            self.version = version
+        self.checked_at = now
+
+    def invalidate(self):
+        """Меняет версию списка: все процессы перечитают его из БД."""
+        bump_version(VERSION_KEY)
+        self.checked_at = None
+
+
+bad_words = BadWordsList()
+
+
+class ModerationResult:
+    """Итог массовой модерации: число строк, пачек и затраченное время."""
+
+    def __init__(self):
+        self.rows = 0
+        self.batches = 0
+        self.seconds = 0.0
+
+    @property
+    def rate(self):
+        """Строк в секунду."""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (
+            f'Строк: {self.rows}, пачек: {self.batches}, '
+            f'за {self.seconds:.2f} с ({self.rate:.0f} строк/с)'
+        )
+
+
+def select_comments(author=None, since=None, until=None, bad_words=False):
+    """
+    Комментарии для массовой модерации.
+
+    Фильтры: автор, время создания [since, until) и совпадение
+    с текущим списком запрещённых слов.
+
+    Запрещённые слова ищутся как подстроки, поэтому индекс поиска FTS5,
+    хранящий целые слова, для этого не подходит. SQLite проверяет
+    выражение функцией REGEXP на стороне Python для каждого комментария,
+    прошедшего остальные фильтры: это полный просмотр, порядка 40 тысяч
+    комментариев в секунду. Автор и время сужают выборку заранее.
+    """
+    queryset = Comment.objects.all()
+    if author is not None:
+        queryset = queryset.filter(author=author)
+    if since is not None:
+        queryset = queryset.filter(created__gte=since)
+    if until is not None:
+        queryset = queryset.filter(created__lt=until)
+    if bad_words:
+        pattern = build_pattern(
+            {word.lower() for word in BadWord.objects.values_list(
+                'word', flat=True
+            )}
+        )
+        if pattern is None:
+            return queryset.none()
+        queryset = queryset.filter(text__iregex=pattern.pattern)
+    return queryset
+
+
+def delete_without_signals(comments):
+    """
+    Удаляет комментарии одним DELETE, без сигналов для каждой строки.
+
+    QuerySet.delete() при подключённых обработчиках post_delete сначала
+    читает все комментарии и отправляет сигнал для каждого: статистика
+    и версия новости обновлялись бы по разу на строку. Вызывающий код
+    обязан сам пересчитать NewsStats и сменить версии затронутых
+    новостей; индекс поиска обновляют триггеры БД. На комментарии
+    не ссылаются другие модели, поэтому удалять каскадом нечего.
+    _raw_delete - тот же DELETE, которым QuerySet.delete() удаляет
+    строки модели без обработчиков сигналов.
+    """
+    return comments._raw_delete(comments.db)
+
+
+def moderate_comments(queryset, action, batch_size=None):
+    """
+    Удаляет (action='delete') или скрывает (action='hide') комментарии.
+
+    Комментарии обрабатываются пачками по id, каждая в своей короткой
+    транзакции, без сигналов для каждой строки: статистика затронутых
+    новостей пересчитывается, а их версии в кеше меняются раз на пачку.
+    """
+    batch_size = batch_size or settings.COMMENTS_MODERATION_BATCH_SIZE
+    if action == 'hide':
+        queryset = queryset.filter(is_hidden=False)
+    queryset = queryset.order_by('pk').values_list('pk', 'news_id')
+    result = ModerationResult()
+    started = time.perf_counter()
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        ids = [pk for pk, _ in batch]
+        news_ids = sorted({news_id for _, news_id in batch})
+        with transaction.atomic():
+            comments = Comment.objects.filter(pk__in=ids)
+            if action == 'delete':
+                result.rows += delete_without_signals(comments)
+            else:
+                result.rows += comments.update(is_hidden=True)
+            rebuild_stats(news_ids)
+        for news_id in news_ids:
+            bump_news_version(news_id)
+        result.batches += 1
+        last_pk = ids[-1]
+    result.seconds = time.perf_counter() - started
+    return result
@@ -0,0 +1,70 @@
+"""Постраничный вывод комментариев по ключу (created, id)."""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import Http404
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from .models import Comment
+
+
+def encode_cursor(comment):
+    """Курсор указывает на последний показанный комментарий."""
+    raw = f'{comment.created.isoformat()}|{comment.pk}'
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Возвращает пару (created, id) или 404 для испорченного курсора."""
+    try:
+        created, pk = urlsafe_b64decode(cursor.encode()).decode().split('|')
+        created, pk = parse_datetime(created), int(pk)
+    except ValueError:
+        raise Http404('Некорректный курсор.')
+    if created is None:
+        raise Http404('Некорректный курсор.')
+    return created, pk
+
+
+class CommentPage:
+    """
+    Страница комментариев к новости.
+
+    Следующая страница выбирается условием по (created, id), а не OFFSET,
+    поэтому её стоимость не зависит от глубины прокрутки.
+    Запрос выполняется лениво, при первом обращении к комментариям.
+    """
+
+    def __init__(self, news_id, cursor=None, size=None):
+        self.news_id = news_id
+        self.after = decode_cursor(cursor) if cursor else None
+        self.size = size or settings.COMMENTS_COUNT_ON_PAGE
+
+    @cached_property
+    def _comments(self):
+        queryset = Comment.objects.filter(
+            news_id=self.news_id, is_hidden=False
+        ).select_related('author').order_by('created', 'id')
+        if self.after:
+            created, pk = self.after
+            queryset = queryset.filter(
+                Q(created__gt=created) | Q(created=created, pk__gt=pk)
+            )
+        # Лишний комментарий показывает, есть ли следующая страница.
+        return list(queryset[:self.size + 1])
+
+    @property
+    def object_list(self):
+        return self._comments[:self.size]
+
+    @property
+    def has_next(self):
+        return len(self._comments) > self.size
+
+    @property
+    def next_cursor(self):
+        if self.has_next:
+            return encode_cursor(self.object_list[-1])
+        return None
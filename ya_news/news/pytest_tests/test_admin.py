@@ -0,0 +1,72 @@
+import pytest
+from django.contrib import admin
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from news.admin import CommentAdmin
+from news.models import Comment
+from news.pytest_tests.test_query_plans import is_slow_step, query_plan
+
+pytestmark = pytest.mark.django_db
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(queries)
+
+
+def add_comments(news, author, count):
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Текст {index}')
+        for index in range(count)
+    )
+
+
+def test_news_change_page_ignores_comments(admin_client, news, author):
+    """Число запросов страницы новости не зависит от числа комментариев"""
+
+    url = reverse('admin:news_news_change', args=(news.pk,))
+    admin_client.get(url)
+    before = count_queries(admin_client, url)
+    add_comments(news, author, 50)
+    assert count_queries(admin_client, url) == before
+    link = reverse('admin:news_comment_changelist')
+    assert f'{link}?news__id__exact={news.pk}' in (
+        admin_client.get(url).content.decode()
+    )
+
+
+@pytest.mark.usefixtures('news_list')
+def test_changelists_do_not_grow(admin_client, news, author):
+    """Списки новостей и комментариев не делают запросов на строку"""
+
+    urls = (
+        reverse('admin:news_news_changelist'),
+        reverse('admin:news_comment_changelist') + f'?news__id__exact='
+        f'{news.pk}&q={author.username}',
+    )
+    for url in urls:
+        admin_client.get(url)
+    before = [count_queries(admin_client, url) for url in urls]
+    add_comments(news, author, 50)
+    assert [count_queries(admin_client, url) for url in urls] == before
+
+
+def test_comment_search_uses_username_index(admin_client, comment, author):
+    """Поиск комментариев по имени автора идёт по индексам, без просмотра"""
+
+    url = reverse('admin:news_comment_changelist')
+    response = admin_client.get(url, {'q': author.username})
+    assert list(response.context['cl'].result_list) == [comment]
+    response = admin_client.get(url, {'q': author.username.upper()})
+    assert list(response.context['cl'].result_list) == []
+    model_admin = CommentAdmin(Comment, admin.site)
+    queryset, _ = model_admin.get_search_results(
+        None, Comment.objects.order_by('-id'), author.username
+    )
+    plan = query_plan(*queryset.query.sql_with_params())
+    assert not [step for step in plan if is_slow_step(step)]
+    assert any('auth_user' in step and 'username=?' in step for step in plan)
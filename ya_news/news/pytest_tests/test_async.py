@@ -0,0 +1,93 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.db import connections
+from django.http import Http404
+
+from news import views
+from news.async_views import AsyncNewsDetail, AsyncNewsList
+from news.models import Comment
+
+# Потоки пула работают со своими соединениями с БД,
+# поэтому данные теста должны быть зафиксированы.
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture(autouse=True)
+def close_pool_connections(monkeypatch):
+    """Постоянные соединения потоков пула пережили бы тестовую БД."""
+    monkeypatch.setitem(connections.databases['default'], 'CONN_MAX_AGE', 0)
+
+
+def call(view, request, **kwargs):
+    if asyncio.iscoroutinefunction(view):
+        view = async_to_sync(view)
+    response = view(request, **kwargs)
+    if callable(getattr(response, 'render', None)):
+        response.render()
+    return response
+
+
+def get(rf, user=None, **headers):
+    request = rf.get('/', **headers)
+    request.user = user or AnonymousUser()
+    return request
+
+
+def test_views_are_coroutines():
+    """Асинхронные представления распознаются Django как корутины"""
+
+    for view in (AsyncNewsList.as_view(), AsyncNewsDetail.as_view()):
+        assert asyncio.iscoroutinefunction(view)
+
+
+@pytest.mark.usefixtures('news_list', 'comment_list')
+@pytest.mark.parametrize(
+    'sync_view, async_view, kwargs',
+    (
+        (views.NewsList, AsyncNewsList, {}),
+        (views.NewsDetail, AsyncNewsDetail, {'pk': 'news'}),
+    )
+)
+def test_async_pages_match_sync(rf, news, sync_view, async_view, kwargs,):
+    """Асинхронные страницы совпадают с синхронными"""
+
+    kwargs = {key: news.pk for key in kwargs}
+    expected = call(sync_view.as_view(), get(rf), **kwargs)
+    response = call(async_view.as_view(), get(rf), **kwargs)
+    assert response.status_code == HTTPStatus.OK
+    assert response.content == expected.content
+    assert response['ETag'] == expected['ETag']
+
+
+@pytest.mark.parametrize('view', (AsyncNewsList, AsyncNewsDetail))
+def test_async_not_modified(rf, news, view,):
+    """Асинхронные страницы отвечают 304 на повторный условный запрос"""
+
+    response = call(view.as_view(), get(rf), pk=news.pk)
+    repeat = call(
+        view.as_view(),
+        get(rf, HTTP_IF_NONE_MATCH=response['ETag']),
+        pk=news.pk,
+    )
+    assert repeat.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_async_detail_not_found(rf,):
+    """Несуществующая новость - ошибка 404"""
+
+    with pytest.raises(Http404):
+        call(AsyncNewsDetail.as_view(), get(rf), pk=0)
+
+
+def test_async_detail_post_comment(rf, author, news,):
+    """Комментарий отправляется на асинхронную страницу новости"""
+
+    request = rf.post('/', {'text': 'Текст комментария'})
+    request.user = author
+    response = call(AsyncNewsDetail.as_view(), request, pk=news.pk)
+    assert response.status_code == HTTPStatus.FOUND
+    assert Comment.objects.filter(news=news, author=author).exists()
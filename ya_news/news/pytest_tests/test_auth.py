@@ -0,0 +1,58 @@
+import pytest
+from django.contrib.auth import get_user
+from django.test import Client
+from django.urls import reverse
+
+from yanews import auth
+from yanews.auth import user_version
+
+pytestmark = pytest.mark.django_db
+
+
+def test_session_and_user_cached(
+    author_client, news_pk, comment, django_assert_num_queries,
+):
+    """Повторный запрос не читает из БД ни сессию, ни пользователя"""
+
+    url = reverse('news:comments', args=news_pk)
+    author_client.get(url)
+    # Остаётся только запрос страницы комментариев.
+    with django_assert_num_queries(1):
+        author_client.get(url)
+
+
+def test_password_change_ends_session(author_client, author, news_pk,):
+    """Смена пароля сразу завершает сессии с закешированным пользователем"""
+
+    url = reverse('news:comments', args=news_pk)
+    author_client.get(url)
+    author.set_password('новый-пароль')
+    author.save()
+    response = author_client.get(url)
+    assert not response.wsgi_request.user.is_authenticated
+
+
+def test_logout_drops_cached_user(author_client, author,):
+    """После выхода закешированный пользователь не используется"""
+
+    author_client.get(reverse('news:home'))
+    version = user_version(author.pk)
+    author_client.get(reverse('users:logout'))
+    assert user_version(author.pk) != version
+    assert not get_user(author_client).is_authenticated
+
+
+def test_cached_users_bounded(django_user_model, settings,):
+    """Давно не запрошенный пользователь вытесняется из памяти процесса"""
+
+    settings.AUTH_USER_CACHE_SIZE = 2
+    clients = {}
+    for i in range(3):
+        user = django_user_model.objects.create(username=f'Пользователь {i}')
+        clients[user.pk] = Client()
+        clients[user.pk].force_login(user)
+    first, second, third = clients
+    auth._users.clear()
+    for pk in (first, second, first, third):
+        clients[pk].get(reverse('news:home'))
+    assert list(auth._users) == [first, third]
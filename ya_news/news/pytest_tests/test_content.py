@@ -1,9 +1,17 @@
+import os
+import subprocess
+import sys
 from datetime import date
+from http import HTTPStatus
 
 import pytest
 from django.conf import settings
+from django.test import Client
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.http import http_date
+
+from news.models import Comment
 
 pytestmark = pytest.mark.django_db
 
@@ -33,6 +41,175 @@ def test_news_sort(client,):
     )
 
 
+@pytest.mark.parametrize('comments_count', (1, 50))
+def test_home_page_cost_does_not_grow_with_comments(
+    client,
+    news,
+    author,
+    comments_count,
+    django_assert_num_queries,
+):
+    """
+    Число запросов к БД на главной не зависит от числа комментариев,
+    тексты комментариев при этом не загружаются
+    """
+
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Текст {i}')
+        for i in range(comments_count)
+    )
+    url = reverse('news:home')
+    with django_assert_num_queries(1) as captured:
+        response = client.get(url)
+    assert f'Комментариев: {comments_count}' in response.content.decode()
+    assert not any(
+        '"news_comment"."text"' in query['sql']
+        for query in captured.captured_queries
+    )
+
+
+def test_home_page_fragment_cache(
+    client,
+    news,
+    author,
+    django_assert_num_queries,
+):
+    """
+    Список новостей на главной берётся из кеша,
+    новый комментарий сбрасывает кеш
+    """
+
+    url = reverse('news:home')
+    client.get(url)
+    with django_assert_num_queries(0):
+        client.get(url)
+    Comment.objects.create(news=news, author=author, text='Текст')
+    response = client.get(url)
+    assert 'Комментариев: 1' in response.content.decode()
+
+
+def test_detail_comments_fragment_cache(
+    author_client,
+    comment,
+    news_pk,
+    django_assert_num_queries,
+):
+    """
+    Комментарии для анонимов берутся из кеша,
+    ссылки на правку комментария в общий кеш не попадают
+    """
+
+    url = reverse('news:detail', args=news_pk)
+    edit_url = reverse('news:edit', args=(comment.pk,))
+    anonymous_client = Client()
+    anonymous_client.get(url)
+    # Остаётся только запрос за самой новостью.
+    with django_assert_num_queries(1):
+        response = anonymous_client.get(url)
+    assert comment.text in response.content.decode()
+    assert edit_url in author_client.get(url).content.decode()
+    assert edit_url not in anonymous_client.get(url).content.decode()
+    comment.text = 'Новый текст комментария'
+    comment.save()
+    response = anonymous_client.get(url)
+    assert comment.text in response.content.decode()
+
+
+def test_fragment_cache_shared_between_processes(client, comment, news_pk,):
+    """
+    Новую версию новости из другого процесса видят все процессы:
+    закешированный блок комментариев перестаёт использоваться
+    """
+
+    url = reverse('news:detail', args=news_pk)
+    client.get(url)
+    # Правка мимо сигналов: версию изменит только другой процесс.
+    Comment.objects.filter(pk=comment.pk).update(text='Новый текст')
+    assert 'Новый текст' not in client.get(url).content.decode()
+    subprocess.run(
+        (
+            sys.executable, '-c',
+            'import django; django.setup(); '
+            'from news.caching import bump_news_version; '
+            f'bump_news_version({comment.news_id})',
+        ),
+        cwd=settings.BASE_DIR,
+        env={
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'yanews.settings',
+            'CACHE_BACKEND': settings.CACHES['default']['BACKEND'],
+            'CACHE_LOCATION': settings.CACHES['default']['LOCATION'],
+        },
+        check=True,
+    )
+    assert 'Новый текст' in client.get(url).content.decode()
+
+
+def test_home_page_conditional_get(client, news, django_assert_num_queries,):
+    """Неизменившаяся главная отдаётся ответом 304 без запросов к БД"""
+
+    url = reverse('news:home')
+    etag = client.get(url)['ETag']
+    with django_assert_num_queries(0):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    news.title = 'Новый заголовок'
+    news.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_detail_conditional_get(
+    client,
+    comment,
+    news_pk,
+    django_assert_num_queries,
+):
+    """
+    Неизменившаяся страница новости отдаётся ответом 304
+    без запросов к БД, новый комментарий меняет ETag
+    """
+
+    url = reverse('news:detail', args=news_pk)
+    etag = client.get(url)['ETag']
+    with django_assert_num_queries(0):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    comment.text = 'Исправленный текст'
+    comment.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_detail_if_modified_since_only(client, comment, news_pk,):
+    """
+    Проверка только по If-Modified-Since не отвечает 304
+    на страницу с исправленным комментарием
+    """
+
+    url = reverse('news:detail', args=news_pk)
+    response = client.get(url)
+    since = response.get('Last-Modified', http_date())
+    comment.text = 'Исправленный текст'
+    comment.save()
+    response = client.get(url, HTTP_IF_MODIFIED_SINCE=since)
+    assert response.status_code == HTTPStatus.OK
+    assert comment.text in response.content.decode()
+
+
+def test_home_if_modified_since_only(client, news,):
+    """Главная не отвечает 304 только по If-Modified-Since"""
+
+    url = reverse('news:home')
+    response = client.get(url)
+    assert not response.has_header('Last-Modified')
+    news.title = 'Исправленный заголовок'
+    news.save()
+    response = client.get(url, HTTP_IF_MODIFIED_SINCE=http_date())
+    assert response.status_code == HTTPStatus.OK
+    assert news.title in response.content.decode()
+
+
 @pytest.mark.usefixtures('comment_list')
 def test_comment_sort(client, news_pk,):
     """
@@ -51,6 +228,72 @@ def test_comment_sort(client, news_pk,):
     )
 
 
+@pytest.mark.usefixtures('comment_list')
+def test_comments_keyset_pagination(client, news_pk, settings,):
+    """
+    Комментарии на странице новости выводятся постранично,
+    следующая страница отдаётся фрагментом по курсору
+    """
+
+    settings.COMMENTS_COUNT_ON_PAGE = 2
+    url = reverse('news:detail', args=news_pk)
+    first_page = client.get(url).context['comments']
+    assert len(first_page.object_list) == settings.COMMENTS_COUNT_ON_PAGE
+    assert first_page.has_next
+    url = reverse('news:comments', args=news_pk)
+    response = client.get(url, {'cursor': first_page.next_cursor})
+    second_page = response.context['comments']
+    assert not second_page.has_next
+    comments_list = first_page.object_list + second_page.object_list
+    assert comments_list == list(Comment.objects.order_by('created', 'id'))
+
+
+def test_comment_page_cost_does_not_depend_on_depth(
+    client,
+    news,
+    author,
+    settings,
+    django_assert_num_queries,
+):
+    """
+    Каждая следующая страница комментариев стоит один запрос,
+    комментарии с одинаковым временем создания не теряются
+    """
+
+    settings.COMMENTS_COUNT_ON_PAGE = 10
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Текст {i}')
+        for i in range(35)
+    )
+    url = reverse('news:comments', args=(news.pk,))
+    comments_list, cursor = [], ''
+    while True:
+        with django_assert_num_queries(1):
+            response = client.get(url, {'cursor': cursor})
+        page = response.context['comments']
+        comments_list += page.object_list
+        if not page.has_next:
+            break
+        cursor = page.next_cursor
+    assert comments_list == list(Comment.objects.order_by('created', 'id'))
+
+
+def test_invalid_comments_cursor(client, news_pk,):
+    """Для испорченного курсора возвращается ошибка 404"""
+
+    url = reverse('news:detail', args=news_pk)
+    response = client.get(url, {'cursor': 'испорчен'})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_comments_of_missing_news(client, news_pk,):
+    """Для несуществующей новости страница комментариев отвечает 404"""
+
+    url = reverse('news:comments', args=(news_pk[0] + 1,))
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
 @pytest.mark.parametrize(
     'user, expected_form',
     (
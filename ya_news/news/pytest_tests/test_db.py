@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+from django.conf import settings
+from django.db import connection, transaction
+
+from news.models import Comment
+
+WRITERS_COUNT = 8
+COMMENTS_PER_WRITER = 25
+
+
+@pytest.mark.django_db
+def test_sqlite_pragmas_applied():
+    """Настройки профиля SQLite действуют в каждом новом соединении"""
+
+    new_connection = connection.copy()
+    try:
+        with new_connection.cursor() as cursor:
+            for name, value in settings.SQLITE_PRAGMAS.items():
+                cursor.execute(f'PRAGMA {name}')
+                actual = cursor.fetchone()[0]
+                if name == 'synchronous':
+                    # SQLite возвращает уровень числом: NORMAL - 1.
+                    actual = ('off', 'normal', 'full', 'extra')[actual]
+                assert str(actual).lower() == str(value).lower(), name
+    finally:
+        new_connection.close()
+
+
+def create_comment(news, author, text):
+    Comment.objects.create(news=news, author=author, text=text)
+
+
+def create_comment_in_transaction(news, author, text):
+    """Триггер индекса поиска открывает его внутри транзакции."""
+    with transaction.atomic():
+        Comment.objects.create(news=news, author=author, text=text)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize(
+    'write', (create_comment, create_comment_in_transaction)
+)
+def test_concurrent_comment_writers(news, author, write,):
+    """Одновременные писатели не получают ошибку database is locked"""
+
+    barrier = threading.Barrier(WRITERS_COUNT)
+    errors = []
+
+    def write_comments(number):
+        try:
+            barrier.wait()
+            for i in range(COMMENTS_PER_WRITER):
+                write(news, author, f'Текст {number}-{i}')
+        except Exception as error:
+            errors.append(error)
+        finally:
+            connection.close()
+
+    threads = [
+        threading.Thread(target=write_comments, args=(number,))
+        for number in range(WRITERS_COUNT)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert Comment.objects.count() == WRITERS_COUNT * COMMENTS_PER_WRITER
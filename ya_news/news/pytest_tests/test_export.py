@@ -0,0 +1,123 @@
+import csv
+import gzip
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.urls import reverse
+
+from news.export import iter_chunks
+from news.models import Comment
+from news.pytest_tests.test_query_plans import is_slow_step, query_plan
+
+pytestmark = pytest.mark.django_db
+
+EXPORT_URL = reverse('news:export')
+
+
+def read_export(response):
+    """Тело потокового ответа целиком."""
+    assert response.streaming
+    return b''.join(response.streaming_content)
+
+
+@pytest.mark.parametrize(
+    'user_client, status',
+    (
+        (pytest.lazy_fixture('author_client'), HTTPStatus.FORBIDDEN),
+        (pytest.lazy_fixture('admin_client'), HTTPStatus.OK),
+    )
+)
+def test_export_only_for_staff(user_client, status,):
+    """Выгрузка доступна только персоналу"""
+
+    response = user_client.get(EXPORT_URL)
+    assert response.status_code == status
+
+
+@pytest.mark.usefixtures('comment_list')
+def test_export_comments_ndjson(admin_client, news,):
+    """Комментарии выгружаются по возрастанию id с датами в ISO 8601"""
+
+    response = admin_client.get(EXPORT_URL, {'type': 'comments'})
+    rows = [json.loads(line) for line in read_export(response).splitlines()]
+    comments = Comment.objects.order_by('pk')
+    assert [row['id'] for row in rows] == [c.pk for c in comments]
+    assert rows[0]['news_id'] == news.pk
+    assert rows[0]['created'] == comments[0].created.isoformat()
+
+
+def test_export_marks_hidden_comments(admin_client, comment, news, author,):
+    """Скрытые комментарии выгружаются с отметкой is_hidden"""
+
+    hidden = Comment.objects.create(
+        news=news, author=author, text='Реклама', is_hidden=True
+    )
+    response = admin_client.get(EXPORT_URL, {'type': 'comments'})
+    rows = [json.loads(line) for line in read_export(response).splitlines()]
+    assert {row['id']: row['is_hidden'] for row in rows} == {
+        comment.pk: False, hidden.pk: True,
+    }
+
+
+@pytest.mark.usefixtures('news_list')
+def test_export_since_watermark(admin_client, settings,):
+    """Параметр since отдаёт только строки после водяного знака"""
+
+    settings.NEWS_EXPORT_CHUNK_SIZE = 3
+    response = admin_client.get(EXPORT_URL, {'format': 'csv'})
+    rows = list(csv.DictReader(io.StringIO(read_export(response).decode())))
+    assert len(rows) == settings.NEWS_COUNT_ON_HOME_PAGE + 1
+    watermark = rows[4]['id']
+    response = admin_client.get(
+        EXPORT_URL, {'format': 'csv', 'since': watermark}
+    )
+    newer = list(csv.DictReader(io.StringIO(read_export(response).decode())))
+    assert newer == rows[5:]
+
+
+@pytest.mark.usefixtures('news_list')
+def test_export_gzip(admin_client,):
+    """Сжатая выгрузка распаковывается в ту же несжатую"""
+
+    plain = read_export(admin_client.get(EXPORT_URL))
+    response = admin_client.get(EXPORT_URL, {'gzip': '1'})
+    assert response['Content-Type'] == 'application/gzip'
+    assert gzip.decompress(read_export(response)) == plain
+
+
+@pytest.mark.parametrize(
+    'params',
+    ({'type': 'users'}, {'format': 'xml'}, {'since': 'вчера'}),
+)
+def test_export_bad_params(admin_client, params,):
+    """Неизвестный тип, формат или водяной знак - ошибка 400"""
+
+    response = admin_client.get(EXPORT_URL, params)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.usefixtures('comment_list')
+def test_export_chunks_use_primary_key(django_assert_num_queries,):
+    """Порции читаются отдельными запросами по первичному ключу"""
+
+    chunks = iter_chunks('comments', chunk_size=2)
+    with django_assert_num_queries(3):
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+    sql = str(
+        Comment.objects.order_by('pk').filter(pk__gt=0)[:2].query
+    )
+    assert not [step for step in query_plan(sql) if is_slow_step(step)]
+
+
+@pytest.mark.usefixtures('news_list')
+def test_export_command(tmp_path,):
+    """Команда export_news пишет сжатую выгрузку в файл"""
+
+    path = tmp_path / 'news.ndjson.gz'
+    call_command('export_news', '--gzip', '--output', str(path))
+    lines = gzip.decompress(path.read_bytes()).splitlines()
+    assert len(lines) == settings.NEWS_COUNT_ON_HOME_PAGE + 1
@@ -0,0 +1,97 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db.models.signals import post_delete
+from django.urls import reverse
+
+from news.caching import news_version
+from news.models import BadWord, Comment, NewsStats
+from news.search import SearchPage
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+@pytest.fixture
+def spammer():
+    return User.objects.create(username='Спамер')
+
+
+@pytest.fixture
+def spam(news, spammer):
+    Comment.objects.bulk_create(
+        Comment(news=news, author=spammer, text=f'Реклама {index}')
+        for index in range(5)
+    )
+    return list(Comment.objects.filter(author=spammer).order_by('pk'))
+
+
+def moderate(*args):
+    stdout = StringIO()
+    call_command('moderate_comments', *args, stdout=stdout)
+    return stdout.getvalue()
+
+
+def test_hide_author_comments(client, news, comment, spam, spammer):
+    """Скрытые комментарии пропадают со страницы и из статистики"""
+
+    output = moderate('--author', spammer.username, '--batch-size', '2')
+    assert 'Строк: 5, пачек: 3' in output
+    assert Comment.objects.filter(is_hidden=True).count() == len(spam)
+    page = client.get(
+        reverse('news:detail', args=(news.pk,))
+    ).context['comments']
+    assert page.object_list == [comment]
+    stats = NewsStats.objects.get(news=news)
+    assert (stats.comment_count, stats.distinct_authors) == (1, 1)
+
+
+def test_delete_bad_words(news, comment, spam):
+    """
+    Комментарии с запрещёнными словами удаляются без сигналов,
+    статистика, версия новости и индекс поиска всё равно обновляются
+    """
+
+    BadWord.objects.create(word='рекл')
+    version = news_version(news.pk)
+    deleted = []
+
+    def on_delete(instance, **kwargs):
+        deleted.append(instance)
+
+    post_delete.connect(on_delete, sender=Comment)
+    try:
+        output = moderate('--action', 'delete', '--bad-words')
+    finally:
+        post_delete.disconnect(on_delete, sender=Comment)
+    assert 'Строк: 5, пачек: 1' in output
+    assert deleted == []
+    assert list(Comment.objects.all()) == [comment]
+    assert NewsStats.objects.get(news=news).comment_count == 1
+    assert news_version(news.pk) != version
+    assert SearchPage('Реклама').object_list == []
+
+
+def test_filter_required():
+    """Без фильтров команда ничего не удаляет"""
+
+    with pytest.raises(CommandError):
+        moderate('--action', 'delete')
+
+
+def test_admin_actions(admin_client, comment, spam):
+    """Действия админки скрывают и удаляют выбранные комментарии"""
+
+    url = reverse('admin:news_comment_changelist')
+    selected = [item.pk for item in spam]
+    admin_client.post(url, {
+        'action': 'hide_comments', '_selected_action': selected[:2],
+    })
+    assert Comment.objects.filter(is_hidden=True).count() == 2
+    admin_client.post(url, {
+        'action': 'delete_comments', '_selected_action': selected,
+    })
+    assert list(Comment.objects.all()) == [comment]
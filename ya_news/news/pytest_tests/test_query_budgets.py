@@ -0,0 +1,88 @@
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+
+from news import urls
+from yanews.middleware import QueryStats
+
+pytestmark = pytest.mark.django_db
+
+# Маршрут: (клиент, фикстура с аргументами, параметры запроса,
+# допустимое число SQL-запросов). Для вошедшего пользователя один запрос
+# уходит на него самого (сессия читается из кеша). Поиск находит
+# комментарии и дочитывает их новости, выгрузка доступна только
+# персоналу и читается целиком: последняя пачка пустая.
+QUERY_BUDGETS = {
+    'news:home': ('author_client', None, None, 2),
+    'news:discussed': ('author_client', None, None, 2),
+    'news:detail': ('author_client', 'news_pk', None, 3),
+    'news:comments': ('author_client', 'news_pk', None, 2),
+    'news:edit': ('author_client', 'comment_pk', None, 2),
+    'news:delete': ('author_client', 'comment_pk', None, 2),
+    'news:search': ('author_client', None, {'q': 'комментария'}, 3),
+    'news:export': ('admin_client', None, {'type': 'comments'}, 3),
+}
+
+# Запись: (фикстура с аргументами, данные формы, допустимое число
+# SQL-запросов). Кроме самой записи форма читает список запрещённых
+# слов, новый и удалённый комментарий обновляют статистику новости.
+WRITE_BUDGETS = {
+    'news:detail': ('news_pk', {'text': 'Новый комментарий'}, 4),
+    'news:edit': ('comment_pk', {'text': 'Новый текст'}, 3),
+    'news:delete': ('comment_pk', None, 3),
+}
+
+
+def test_every_route_has_budget():
+    """Для каждого маршрута приложения задан бюджет запросов"""
+
+    names = {
+        f'{urls.app_name}:{pattern.name}' for pattern in urls.urlpatterns
+    }
+    assert names == set(QUERY_BUDGETS)
+
+
+@pytest.mark.usefixtures('news_list', 'comment_list')
+@pytest.mark.parametrize('name', QUERY_BUDGETS)
+def test_route_fits_query_budget(request, name,):
+    """Страница укладывается в бюджет и не повторяет запросы"""
+
+    client_fixture, args_fixture, params, budget = QUERY_BUDGETS[name]
+    client = request.getfixturevalue(client_fixture)
+    args = request.getfixturevalue(args_fixture) if args_fixture else None
+    url = reverse(name, args=args)
+    with QueryStats() as stats:
+        response = client.get(url, params)
+        if response.streaming:
+            b''.join(response.streaming_content)
+    assert response.status_code == HTTPStatus.OK
+    assert stats.count <= budget
+    assert stats.duplicates == 0
+
+
+@pytest.mark.usefixtures('news_list', 'comment_list')
+@pytest.mark.parametrize('name', WRITE_BUDGETS)
+def test_write_fits_query_budget(request, author_client, name,):
+    """Запись укладывается в бюджет и не повторяет запросы"""
+
+    args_fixture, data, budget = WRITE_BUDGETS[name]
+    url = reverse(name, args=request.getfixturevalue(args_fixture))
+    author_client.get(reverse('news:home'))
+    with QueryStats() as stats:
+        response = author_client.post(url, data)
+    assert response.status_code == HTTPStatus.FOUND
+    assert stats.count <= budget
+    assert stats.duplicates == 0
+
+
+@pytest.mark.parametrize('debug', (True, False))
+def test_query_stats_headers(client, settings, debug,):
+    """Заголовки со статистикой SQL добавляются только в режиме отладки"""
+
+    settings.DEBUG = debug
+    response = client.get(reverse('news:home'))
+    assert response.has_header('X-Query-Count') == debug
+    if debug:
+        assert response['X-Query-Count'] == '1'
+        assert response['X-Query-Duplicates'] == '0'
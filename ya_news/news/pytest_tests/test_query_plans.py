@@ -0,0 +1,59 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from news.pagination import encode_cursor
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def cursor(comment):
+    return {'cursor': encode_cursor(comment)}
+
+
+def query_plan(sql, params=()):
+    """Шаги плана выполнения запроса в SQLite."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def is_slow_step(step):
+    """Полный просмотр таблицы или сортировка во временном B-дереве."""
+    full_scan = step.startswith('SCAN') and ' USING ' not in step
+    return full_scan or 'TEMP B-TREE' in step
+
+
+@pytest.mark.usefixtures('news_list', 'comment_list')
+@pytest.mark.parametrize(
+    'name, args, params',
+    (
+        ('news:home', None, None),
+        ('news:discussed', None, None),
+        ('news:detail', pytest.lazy_fixture('news_pk'), None),
+        ('news:comments', pytest.lazy_fixture('news_pk'), None),
+        (
+            'news:comments',
+            pytest.lazy_fixture('news_pk'),
+            pytest.lazy_fixture('cursor'),
+        ),
+        ('news:edit', pytest.lazy_fixture('comment_pk'), None),
+        ('news:delete', pytest.lazy_fixture('comment_pk'), None),
+    )
+)
+def test_pages_use_indexes(author_client, name, args, params,):
+    """Запросы страниц не просматривают таблицы целиком и не сортируют"""
+
+    url = reverse(name, args=args)
+    with CaptureQueriesContext(connection) as captured:
+        author_client.get(url, params)
+    selects = [
+        query['sql'] for query in captured.captured_queries
+        if query['sql'].startswith('SELECT')
+    ]
+    assert selects
+    for sql in selects:
+        slow_steps = [step for step in query_plan(sql) if is_slow_step(step)]
+        assert not slow_steps, f'{sql}\n{slow_steps}'
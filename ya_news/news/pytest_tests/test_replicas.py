@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connections
+from django.urls import reverse
+
+from news.caching import bump_news_version
+from news.models import News
+from yanews.db import STICKY_COOKIE
+
+pytestmark = pytest.mark.django_db
+
+REPLICA = 'replica'
+
+
+def remove_replica():
+    if REPLICA in connections.databases:
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.databases[REPLICA]
+
+
+@pytest.fixture
+def replica(request, settings, tmp_path):
+    """Реплика - отдельный файл SQLite со своими данными."""
+    connections.databases[REPLICA] = {
+        **connections.databases['default'],
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+    }
+    request.addfinalizer(remove_replica)
+    settings.DATABASE_REPLICAS = [REPLICA]
+    call_command('migrate', database=REPLICA, verbosity=0)
+    # Новости на реплике и на основной БД не совпадают и по id.
+    News.objects.using(REPLICA).create(
+        pk=10 ** 6, title='С реплики', text='Текст'
+    )
+    News.objects.create(title='С основной', text='Текст')
+    return REPLICA
+
+
+@pytest.mark.usefixtures('replica')
+def test_read_views_use_replica(client, author_client, settings,):
+    """Главная читает новости с реплики, правка комментариев - нет"""
+
+    # Версии страниц старше окна отставания реплики.
+    settings.REPLICA_STICKY_TTL = 0
+    response = client.get(reverse('news:home'))
+    assert 'С реплики' in response.content.decode()
+    assert 'С основной' not in response.content.decode()
+    news = News.objects.get(title='С основной')
+    response = author_client.get(reverse('news:detail', args=(news.pk,)))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.usefixtures('replica')
+def test_primary_after_write(author_client, settings,):
+    """После записи пользователь читает с основной БД до истечения cookie"""
+
+    news = News.objects.get(title='С основной')
+    response = author_client.post(
+        reverse('news:detail', args=(news.pk,)), {'text': 'Комментарий'}
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    assert STICKY_COOKIE in response.cookies
+    response = author_client.get(reverse('news:detail', args=(news.pk,)))
+    assert response.status_code == HTTPStatus.OK
+    assert 'Комментарий' in response.content.decode()
+    del author_client.cookies[STICKY_COOKIE]
+    settings.REPLICA_STICKY_TTL = 0
+    response = author_client.get(reverse('news:detail', args=(news.pk,)))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.usefixtures('replica')
+def test_primary_while_version_is_young(client, settings,):
+    """
+    Пока версия новости моложе окна отставания реплики, страница
+    читается с основной БД и не кеширует под новой версией старые данные
+    """
+
+    news = News.objects.get(title='С основной')
+    url = reverse('news:detail', args=(news.pk,))
+    bump_news_version(news.pk)
+    assert client.get(url).status_code == HTTPStatus.OK
+    settings.REPLICA_STICKY_TTL = 0
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_no_sticky_cookie_without_replicas(author_client, news,):
+    """Без реплик cookie после записи не выставляется"""
+
+    response = author_client.post(
+        reverse('news:detail', args=(news.pk,)), {'text': 'Комментарий'}
+    )
+    assert STICKY_COOKIE not in response.cookies
@@ -10,6 +10,7 @@ from pytest_django.asserts import assertRedirects
     (
         ('news:home', None),
         ('news:detail', pytest.lazy_fixture('news_pk')),
+        ('news:comments', pytest.lazy_fixture('news_pk')),
         ('users:login', None),
         ('users:logout', None),
         ('users:signup', None),
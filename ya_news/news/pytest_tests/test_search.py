@@ -0,0 +1,99 @@
+import pytest
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.urls import reverse
+
+from news.models import Comment, News
+from news.search import SEARCH_SQL, TITLE_WEIGHT, match_expression, reindex
+
+pytestmark = pytest.mark.django_db
+
+
+def search(client, query, **params):
+    response = client.get(reverse('news:search'), {'q': query, **params})
+    return response.context['results']
+
+
+def test_search_ranks_and_pages(client, author, settings):
+    """Совпадение в заголовке выше, следующая страница идёт по курсору"""
+
+    settings.NEWS_COUNT_ON_HOME_PAGE = 2
+    in_text = News.objects.create(title='Погода', text='Выборы в городе')
+    in_title = News.objects.create(title='Выборы', text='Итоги')
+    by_comment = News.objects.create(title='Спорт', text='Матч')
+    Comment.objects.create(news=by_comment, author=author, text='Не выборы')
+    News.objects.create(title='Кино', text='Премьера')
+    first_page = search(client, 'выборы')
+    assert first_page.object_list[0] == in_title
+    assert first_page.has_next
+    second_page = search(client, 'выборы', cursor=first_page.next_cursor)
+    assert not second_page.has_next
+    found = first_page.object_list + second_page.object_list
+    assert set(found) == {in_text, in_title, by_comment}
+
+
+def test_index_follows_changes(client, news, comment):
+    """Правки, скрытие и удаление сразу видны в поиске"""
+
+    assert search(client, 'комментария').object_list == [news]
+    Comment.objects.filter(pk=comment.pk).update(is_hidden=True)
+    assert search(client, 'комментария').object_list == []
+    News.objects.filter(pk=news.pk).update(title='Молния')
+    assert search(client, 'молни').object_list == [news]
+    news.delete()
+    assert search(client, 'молния').object_list == []
+
+
+def test_query_syntax_is_escaped(client, news):
+    """Синтаксис FTS5 в запросе пользователя не вызывает ошибок"""
+
+    assert match_expression('"a" OR b* -c') == '"a" "OR" "b" "c"*'
+    assert match_expression('  ') is None
+    assert search(client, 'NEAR(" ^').object_list == []
+
+
+def test_reindex_search(client, saved_news, settings):
+    """Команда перестраивает индекс"""
+
+    settings.NEWS_COUNT_ON_HOME_PAGE = len(saved_news)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO news_news_fts(news_news_fts) VALUES ('delete-all')"
+        )
+    assert search(client, 'Заголовок').object_list == []
+    call_command('reindex_search', stdout=None)
+    assert len(search(client, 'Заголовок').object_list) == len(saved_news)
+
+
+def test_reindex_removes_duplicates(comment):
+    """Перестроенный индекс совпадает с таблицей, повторы строк исчезают"""
+
+    # Со значением rank = 1 индекс сверяется с таблицей комментариев.
+    check = (
+        "INSERT INTO news_comment_fts(news_comment_fts, rank) "
+        "VALUES ('integrity-check', 1)"
+    )
+    with connection.cursor() as cursor:
+        # Та же строка ещё раз, как после гонки триггера с перестройкой.
+        cursor.execute(
+            'INSERT INTO news_comment_fts(rowid, text) VALUES (%s, %s)',
+            (comment.pk, comment.text),
+        )
+        with pytest.raises(DatabaseError):
+            with transaction.atomic():
+                cursor.execute(check)
+        list(reindex())
+        cursor.execute(check)
+
+
+def test_search_uses_fts_index():
+    """Поиск читает индексы FTS5 и не просматривает комментарии целиком"""
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'EXPLAIN QUERY PLAN {SEARCH_SQL}',
+            (TITLE_WEIGHT, '"a"', '"a"', True, 0.0, 0, 10),
+        )
+        steps = [row[-1] for row in cursor.fetchall()]
+    assert sum('VIRTUAL TABLE INDEX' in step for step in steps) == 2
+    assert not [step for step in steps if step == 'SCAN comment']
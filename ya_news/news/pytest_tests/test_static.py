@@ -0,0 +1,94 @@
+import gzip
+import json
+
+import pytest
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from yanews import static
+from yanews.middleware import CompressionMiddleware
+
+
+@pytest.fixture
+def collected(settings, tmp_path):
+    settings.STATIC_ROOT = tmp_path
+    settings.STATICFILES_STORAGE = (
+        'yanews.static.CompressedManifestStaticFilesStorage'
+    )
+    call_command('collectstatic', interactive=False, verbosity=0)
+    manifest = json.loads((tmp_path / 'staticfiles.json').read_text())
+    return manifest['paths']
+
+
+@pytest.mark.parametrize(
+    'content_type, size, compressed',
+    (
+        ('text/html; charset=utf-8', 4096, True),
+        ('text/html; charset=utf-8', 512, False),
+        ('application/gzip', 4096, False),
+    ),
+)
+def test_compression_threshold(content_type, size, compressed,):
+    """Сжимаются только текстовые ответы не короче порога"""
+
+    request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+    middleware = CompressionMiddleware(
+        lambda request: HttpResponse(b'a' * size, content_type=content_type)
+    )
+    response = middleware(request)
+    assert response.has_header('Content-Encoding') == compressed
+    if compressed:
+        assert gzip.decompress(response.content) == b'a' * size
+
+
+def test_collectstatic_precompresses(collected, tmp_path,):
+    """collectstatic сохраняет файлы с хешем в имени и их копии .gz"""
+
+    hashed = collected['admin/css/base.css']
+    assert hashed != 'admin/css/base.css'
+    assert gzip.decompress((tmp_path / f'{hashed}.gz').read_bytes()) == (
+        (tmp_path / hashed).read_bytes()
+    )
+    # Файлы короче порога не сжимаются.
+    small = collected['admin/img/icon-yes.svg']
+    assert not (tmp_path / f'{small}.gz').exists()
+
+
+def test_serve_hashed_static(collected,):
+    """Файлы с хешем кешируются навсегда и отдаются сжатыми"""
+
+    factory = RequestFactory()
+    hashed = collected['admin/css/base.css']
+    response = static.serve(
+        factory.get('/', HTTP_ACCEPT_ENCODING='gzip, br'), hashed
+    )
+    assert response['Content-Encoding'] == 'gzip'
+    assert response['Content-Type'].startswith('text/css')
+    assert not response.has_header('Content-Disposition')
+    assert 'immutable' in response['Cache-Control']
+    response = static.serve(factory.get('/'), 'admin/css/base.css')
+    assert not response.has_header('Content-Encoding')
+    assert response['Cache-Control'] == (
+        f'public, max-age={static.MUTABLE_MAX_AGE}'
+    )
+
+
+@pytest.mark.parametrize(
+    'accept_encoding, compressed',
+    (
+        ('gzip;q=0.5, br', True),
+        ('GZIP', True),
+        ('gzip;q=0', False),
+        ('br, gzip; q=0.0', False),
+        ('x-gzip-extra', False),
+    ),
+)
+def test_serve_respects_gzip_qvalue(collected, accept_encoding, compressed,):
+    """Сжатая копия не отдаётся, если клиент отказался от gzip через q=0"""
+
+    request = RequestFactory().get(
+        '/', HTTP_ACCEPT_ENCODING=accept_encoding
+    )
+    response = static.serve(request, collected['admin/css/base.css'])
+    assert response.has_header('Content-Encoding') == compressed
@@ -0,0 +1,71 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+
+from news.models import Comment, NewsStats
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+@pytest.fixture
+def reader():
+    return User.objects.create(username='Читатель')
+
+
+def stats_of(news):
+    stats = NewsStats.objects.get(news=news)
+    return stats.comment_count, stats.distinct_authors, stats.last_comment_at
+
+
+def test_stats_follow_comments(news, author, reader,):
+    """Статистика меняется вместе с созданием и удалением комментариев"""
+
+    assert stats_of(news) == (0, 0, None)
+    Comment.objects.create(news=news, author=author, text='1')
+    second = Comment.objects.create(news=news, author=author, text='2')
+    last = Comment.objects.create(news=news, author=reader, text='3')
+    assert stats_of(news) == (3, 2, last.created)
+    last.delete()
+    assert stats_of(news) == (2, 1, second.created)
+    Comment.objects.filter(news=news).delete()
+    assert stats_of(news) == (0, 0, None)
+
+
+def test_rebuild_news_stats(saved_news, author, reader,):
+    """Команда пересчитывает статистику после массовых операций"""
+
+    Comment.objects.bulk_create(
+        Comment(news=news, author=user, text='Текст')
+        for news in saved_news[:3]
+        for user in (author, reader, reader)
+    )
+    call_command('rebuild_news_stats', '--batch-size', '4', stdout=None)
+    for news in saved_news[:3]:
+        assert stats_of(news)[:2] == (3, 2)
+    assert NewsStats.objects.count() == len(saved_news)
+    assert NewsStats.objects.filter(comment_count=0).count() == (
+        len(saved_news) - 3
+    )
+
+
+def test_discussed_feed(
+    client, saved_news, author, django_assert_num_queries,
+):
+    """Обсуждаемые новости упорядочены по числу комментариев"""
+
+    for count, news in enumerate(saved_news[:3], start=1):
+        for i in range(count):
+            Comment.objects.create(news=news, author=author, text=f'{i}')
+    with django_assert_num_queries(1):
+        response = client.get(reverse('news:discussed'))
+    assert [news.pk for news in response.context['object_list']] == [
+        news.pk for news in reversed(saved_news[:3])
+    ]
+    assert 'Комментариев: 3' in response.content.decode()
+    home = client.get(reverse('news:home'))
+    assert list(home.context['object_list']) != list(
+        response.context['object_list']
+    )
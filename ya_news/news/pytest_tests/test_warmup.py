@@ -0,0 +1,33 @@
+from django.template import engines
+
+from yanews.warmup import warm_up_templates
+
+
+def cached_templates(settings, debug):
+    loaders = [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]
+    if not debug:
+        loaders = [('django.template.loaders.cached.Loader', loaders)]
+    settings.TEMPLATES = [{
+        **settings.TEMPLATES[0],
+        'OPTIONS': {**settings.TEMPLATES[0]['OPTIONS'], 'loaders': loaders},
+    }]
+    return engines['django'].engine.template_loaders[0]
+
+
+def test_warm_up_fills_cached_loader(settings):
+    """Шаблоны проекта загружаются в кеш при старте процесса"""
+
+    loader = cached_templates(settings, debug=False)
+    assert warm_up_templates() > 0
+    for name in ('news/home.html', 'news/detail.html', 'base.html'):
+        assert name in loader.get_template_cache
+
+
+def test_warm_up_skipped_without_cached_loader(settings):
+    """Без кешированного загрузчика шаблоны заранее не загружаются"""
+
+    cached_templates(settings, debug=True)
+    assert warm_up_templates() == 0
@@ -0,0 +1,148 @@
+"""
+Полнотекстовый поиск по новостям и комментариям.
+
+Индексы - таблицы SQLite FTS5 news_news_fts и news_comment_fts
+с внешним содержимым (см. миграцию 0006_search). Их обновляют триггеры
+БД, поэтому индекс не отстаёт и при массовых операциях без сигналов.
+Новость находится по своему заголовку и тексту или по видимым
+комментариям, лучший ранг bm25 из найденного - ранг новости.
+"""
+import re
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.http import Http404
+from django.utils.functional import cached_property
+
+from .models import Comment, News
+
+# Таблица индекса: таблица модели с индексируемым содержимым.
+INDEXES = {
+    'news_news_fts': News._meta.db_table,
+    'news_comment_fts': Comment._meta.db_table,
+}
+# Совпадение в заголовке весит больше, чем в тексте.
+TITLE_WEIGHT = 10.0
+
+SEARCH_SQL = '''
+WITH hits(news_id, rank) AS (
+    SELECT rowid, bm25(news_news_fts, %s, 1.0)
+    FROM news_news_fts
+    WHERE news_news_fts MATCH %s
+    UNION ALL
+    SELECT comment.news_id, bm25(news_comment_fts)
+    FROM news_comment_fts
+    JOIN news_comment AS comment ON comment.id = news_comment_fts.rowid
+    WHERE news_comment_fts MATCH %s AND NOT comment.is_hidden
+)
+SELECT news_id, MIN(rank) AS rank
+FROM hits
+GROUP BY news_id
+HAVING %s OR (MIN(rank), news_id) > (%s, %s)
+ORDER BY rank, news_id
+LIMIT %s
+'''
+
+
+def match_expression(query):
+    """
+    Выражение MATCH из строки пользователя.
+
+    Каждое слово берётся в кавычки, поэтому синтаксис FTS5 в запросе
+    не работает и не может вызвать ошибку; последнее слово ищется
+    как префикс.
+    """
+    words = re.findall(r'\w+', query)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def encode_cursor(rank, pk):
+    raw = f'{rank!r}|{pk}'
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Возвращает пару (rank, id) или 404 для испорченного курсора."""
+    try:
+        rank, pk = urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return float(rank), int(pk)
+    except ValueError:
+        raise Http404('Некорректный курсор.')
+
+
+class SearchPage:
+    """
+    Страница результатов поиска.
+
+    Следующая страница выбирается условием по (rank, id), а не OFFSET.
+    Запрос выполняется лениво, при первом обращении к результатам.
+    """
+
+    def __init__(self, query, cursor=None, size=None):
+        self.query = query
+        self.match = match_expression(query)
+        self.after = decode_cursor(cursor) if cursor else None
+        self.size = size or settings.NEWS_COUNT_ON_HOME_PAGE
+
+    @cached_property
+    def _hits(self):
+        if self.match is None:
+            return []
+        rank, pk = self.after or (0.0, 0)
+        params = (
+            TITLE_WEIGHT, self.match, self.match,
+            self.after is None, rank, pk,
+            self.size + 1,
+        )
+        using = router.db_for_read(News)
+        with connections[using].cursor() as cursor:
+            cursor.execute(SEARCH_SQL, params)
+            hits = cursor.fetchall()
+        news = News.objects.using(using).in_bulk([pk for pk, _ in hits])
+        return [(news[pk], rank) for pk, rank in hits if pk in news]
+
+    @property
+    def object_list(self):
+        return [news for news, _ in self._hits[:self.size]]
+
+    @property
+    def has_next(self):
+        return len(self._hits) > self.size
+
+    @property
+    def next_cursor(self):
+        if self.has_next:
+            news, rank = self._hits[self.size - 1]
+            return encode_cursor(rank, news.pk)
+        return None
+
+
+def reindex(using=None):
+    """
+    Перестраивает индексы поиска по таблицам новостей и комментариев.
+
+    Команда FTS5 'rebuild' очищает индекс и заново заполняет его
+    из таблицы одной инструкцией, то есть в одной транзакции: строка,
+    добавленная триггером во время перестройки, не попадёт в индекс
+    дважды. Запись в таблицу на это время блокируется.
+    Возвращает пары (таблица индекса, число строк).
+    """
+    connection = connections[using or router.db_for_write(News)]
+    for index, table in INDEXES.items():
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {index}({index}) VALUES ('rebuild')"
+                )
+                cursor.execute(f'SELECT count(*) FROM {table}')
+                count, = cursor.fetchone()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {index}({index}) VALUES ('optimize')"
+            )
+        yield index, count
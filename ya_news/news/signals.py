@@ -0,0 +1,39 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import stats
+from .caching import bump_news_version
+from .models import BadWord, Comment, News, NewsStats
+from .moderation import bad_words
+
+
+@receiver((post_save, post_delete), sender=BadWord)
+def invalidate_bad_words(**kwargs):
+    bad_words.invalidate()
+
+
+@receiver((post_save, post_delete), sender=News)
+def invalidate_news(instance, **kwargs):
+    bump_news_version(instance.pk)
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def invalidate_comments(instance, **kwargs):
+    bump_news_version(instance.news_id)
+
+
+@receiver(post_save, sender=News)
+def create_news_stats(instance, created, raw, using, **kwargs):
+    if created and not raw:
+        NewsStats.objects.using(using).create(news=instance)
+
+
+@receiver(post_save, sender=Comment)
+def count_comment(instance, created, raw, using, **kwargs):
+    if created and not raw:
+        stats.comment_added(instance, using)
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_comment(instance, using, **kwargs):
+    stats.comment_removed(instance, using)
@@ -0,0 +1,97 @@
+"""
+Статистика комментариев новостей в NewsStats.
+
+Счётчики меняются одним UPDATE с выражениями F() на каждый новый или
+удалённый комментарий, скрытые комментарии не учитываются.
+Одновременные комментарии одного автора могут сбить число авторов,
+массовые операции сигналов не отправляют: такие расхождения исправляет
+пересчёт командой rebuild_news_stats.
+"""
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Case, Count, Exists, F, Max, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Comment, News, NewsStats
+
+
+def is_new_author(comment, using):
+    """1, если у автора нет других комментариев к новости, иначе 0."""
+    others = Comment.objects.using(using).filter(
+        news_id=comment.news_id,
+        author_id=comment.author_id,
+        is_hidden=False,
+    ).exclude(pk=comment.pk)
+    return Case(When(Exists(others), then=Value(0)), default=Value(1))
+
+
+def comment_added(comment, using=DEFAULT_DB_ALIAS):
+    if comment.is_hidden:
+        return
+    created = Value(comment.created)
+    stats = NewsStats.objects.using(using).filter(news_id=comment.news_id)
+    updated = stats.update(
+        comment_count=F('comment_count') + 1,
+        last_comment_at=Greatest(
+            Coalesce('last_comment_at', created), created
+        ),
+        distinct_authors=F('distinct_authors') + is_new_author(
+            comment, using
+        ),
+    )
+    if not updated:
+        rebuild_stats([comment.news_id], using)
+
+
+def comment_removed(comment, using=DEFAULT_DB_ALIAS):
+    if comment.is_hidden:
+        return
+    last_comment = Comment.objects.using(using).filter(
+        news_id=comment.news_id, is_hidden=False
+    ).order_by('-created').values('created')[:1]
+    stats = NewsStats.objects.using(using).filter(news_id=comment.news_id)
+    stats.update(
+        comment_count=Greatest(F('comment_count') - 1, Value(0)),
+        last_comment_at=Subquery(last_comment),
+        distinct_authors=Greatest(
+            F('distinct_authors') - is_new_author(comment, using), Value(0)
+        ),
+    )
+
+
+def rebuild_stats(news_ids, using=DEFAULT_DB_ALIAS):
+    """Пересчитывает статистику новостей одним запросом с GROUP BY."""
+    rows = Comment.objects.using(using).filter(
+        news_id__in=news_ids, is_hidden=False
+    ).order_by().values('news_id').annotate(
+        comment_count=Count('pk'),
+        last_comment_at=Max('created'),
+        distinct_authors=Count('author', distinct=True),
+    )
+    stats = {row.pop('news_id'): row for row in rows}
+    with transaction.atomic(using=using):
+        NewsStats.objects.using(using).filter(news_id__in=news_ids).delete()
+        NewsStats.objects.using(using).bulk_create(
+            NewsStats(news_id=pk, **stats.get(pk, {})) for pk in news_ids
+        )
+
+
+def rebuild_all(batch_size=None):
+    """
+    Пересчитывает статистику всех новостей пачками по id.
+
+    Возвращает число новостей в каждой пересчитанной пачке.
+    """
+    batch_size = batch_size or settings.NEWS_STATS_BATCH_SIZE
+    last_pk = 0
+    while True:
+        news_ids = list(
+            News.objects.filter(pk__gt=last_pk).order_by('pk').values_list(
+                'pk', flat=True
+            )[:batch_size]
+        )
+        if not news_ids:
+            return
+        rebuild_stats(news_ids)
+        last_pk = news_ids[-1]
+        yield len(news_ids)
@@ -1,16 +1,33 @@
+from django.conf import settings
 from django.urls import path
 
 from news import views
 
+if settings.NEWS_ASYNC_VIEWS:
+    from news import async_views
+    news_list = async_views.AsyncNewsList.as_view()
+    news_detail = async_views.AsyncNewsDetail.as_view()
+else:
+    news_list = views.NewsList.as_view()
+    news_detail = views.NewsDetailView.as_view()
+
 app_name = 'news'
 
 urlpatterns = [
-    path('', views.NewsList.as_view(), name='home'),
-    path('news/<int:pk>/', views.NewsDetailView.as_view(), name='detail'),
+    path('', news_list, name='home'),
+    path('news/<int:pk>/', news_detail, name='detail'),
+    path(
+        'news/<int:pk>/comments/',
+        views.NewsComments.as_view(),
+        name='comments'
+    ),
     path(
         'delete_comment/<int:pk>/',
         views.CommentDelete.as_view(),
         name='delete'
     ),
+    path('discussed/', views.NewsDiscussed.as_view(), name='discussed'),
+    path('search/', views.NewsSearch.as_view(), name='search'),
+    path('export/', views.NewsExport.as_view(), name='export'),
     path('edit_comment/<int:pk>/', views.CommentUpdate.as_view(), name='edit'),
 ]
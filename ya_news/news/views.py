@@ -1,49 +1,201 @@
+import hashlib
+
 from django.conf import settings
-from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import get_object_or_404
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.http import (
+    Http404, HttpResponseBadRequest, StreamingHttpResponse,
+)
 from django.urls import reverse
+from django.utils.decorators import method_decorator
 from django.views import generic
+from django.views.decorators.http import condition
 
+from . import export
+from .caching import home_version, news_version
 from .forms import CommentForm
 from .models import Comment, News
+from .pagination import CommentPage
+from .search import SearchPage
+
+
+def make_etag(*parts):
+    return hashlib.md5(':'.join(map(str, parts)).encode()).hexdigest()
+
+
+def news_list_etag(request, *args, **kwargs):
+    """Главная меняется вместе с её версией в кеше, запросов к БД нет."""
+    return make_etag(home_version(), request.user.pk)
 
 
+def news_detail_etag(request, pk):
+    """
+    Версия новости меняется при любой правке новости и её комментариев.
+
+    В ETag входят адрес с курсором, пользователь и CSRF-cookie,
+    от которой зависит токен в форме комментария. Last-Modified
+    страница не отдаёт: по дате нельзя заметить ни правку старого
+    комментария, ни вход и выход пользователя, и проверка по одному
+    If-Modified-Since отвечала бы 304 на изменившуюся страницу.
+    """
+    return make_etag(
+        news_version(pk),
+        request.get_full_path(),
+        request.user.pk,
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME),
+    )
+
+
+@method_decorator(condition(etag_func=news_list_etag), name='dispatch')
 class NewsList(generic.ListView):
-    """Список новостей."""
+    """
+    Список новостей.
+
+    Как и страница новости, проверяется только по ETag: Last-Modified
+    с точностью до секунды не заметил бы правку в ту же секунду, что и
+    предыдущий ответ, и If-Modified-Since получал бы 304 на новую
+    страницу.
+    """
     model = News
+    read_from_replica = True
     template_name = 'news/home.html'
+    feed = 'home'
+
+    @staticmethod
+    def cache_version(request, **kwargs):
+        """Версия, под которой кешируются список и ETag."""
+        return home_version()
 
     def get_queryset(self):
         """
         Выводим только несколько последних новостей.
 
         Их количество определяется в настройках проекта.
+        Для каждой новости считаем только число комментариев:
+        коррелированный подзапрос выполняется для уже отобранных
+        новостей и не загружает сами комментарии.
         """
-        return self.model.objects.prefetch_related(
-            'comment_set'
+        comment_count = Comment.objects.filter(
+            news=OuterRef('pk'), is_hidden=False
+        ).order_by().values('news').annotate(
+            count=Count('pk')
+        ).values('count')
+        return self.model.objects.annotate(
+            comment_count=Coalesce(Subquery(comment_count), 0)
         )[:settings.NEWS_COUNT_ON_HOME_PAGE]
 
+    def get_context_data(self, **kwargs):
+        """
+        Список кешируется фрагментом шаблона по версии главной.
+
+        Запрос к БД ленивый и не выполняется, если фрагмент есть в кеше.
+        """
+        context = super().get_context_data(**kwargs)
+        context['home_version'] = home_version()
+        context['cache_timeout'] = settings.NEWS_CACHE_TIMEOUT
+        context['feed'] = self.feed
+        return context
+
 
-class NewsDetail(generic.DetailView):
+class NewsDiscussed(NewsList):
+    """
+    Самые обсуждаемые новости.
+
+    Порядок и число комментариев берутся из NewsStats по индексу,
+    комментарии при этом не читаются.
+    """
+    feed = 'discussed'
+
+    def get_queryset(self):
+        return self.model.objects.filter(
+            stats__comment_count__gt=0
+        ).annotate(
+            comment_count=F('stats__comment_count')
+        ).order_by(
+            '-stats__comment_count', '-stats__news_id'
+        )[:settings.NEWS_COUNT_ON_HOME_PAGE]
+
+
+class CommentPageMixin:
+    """Добавляет в контекст страницу комментариев новости."""
+    comments_url_name = 'news:detail'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['comments'] = CommentPage(
+            self.kwargs['pk'], self.request.GET.get('cursor')
+        )
+        context['comments_url'] = reverse(
+            self.comments_url_name, kwargs={'pk': self.kwargs['pk']}
+        )
+        return context
+
+
+@method_decorator(condition(etag_func=news_detail_etag), name='dispatch')
+class NewsDetail(CommentPageMixin, generic.DetailView):
     model = News
+    read_from_replica = True
     template_name = 'news/detail.html'
 
-    def get_object(self, queryset=None):
-        obj = get_object_or_404(
-            self.model.objects.prefetch_related('comment_set__author'),
-            pk=self.kwargs['pk']
-        )
-        return obj
+    @staticmethod
+    def cache_version(request, pk):
+        """Версия, под которой кешируются комментарии и ETag."""
+        return news_version(pk)
 
     def get_context_data(self, **kwargs):
+        """
+        Для анонимов блок комментариев кешируется по версии новости.
+
+        Форма и ссылки на правку комментариев в общий кеш не попадают.
+        """
         context = super().get_context_data(**kwargs)
         if self.request.user.is_authenticated:
             context['form'] = CommentForm()
+        else:
+            context['news_version'] = news_version(self.object.pk)
+            context['cache_timeout'] = settings.NEWS_CACHE_TIMEOUT
+        return context
+
+
+class NewsComments(CommentPageMixin, generic.TemplateView):
+    """Фрагмент страницы новости со следующей страницей комментариев."""
+    template_name = 'news/comments.html'
+    comments_url_name = 'news:comments'
+
+    def get_context_data(self, **kwargs):
+        """
+        Для несуществующей новости возвращается 404.
+
+        Комментарии ссылаются на новость, поэтому непустая страница
+        доказывает, что новость есть; отдельный запрос нужен только
+        для пустой страницы.
+        """
+        context = super().get_context_data(**kwargs)
+        if not context['comments'].object_list and not News.objects.filter(
+            pk=self.kwargs['pk']
+        ).exists():
+            raise Http404('Новость не найдена.')
+        return context
+
+
+class NewsSearch(generic.TemplateView):
+    """Поиск по новостям и комментариям, постранично по рангу."""
+    read_from_replica = True
+    template_name = 'news/search.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.request.GET.get('q', '').strip()
+        context['results'] = SearchPage(
+            context['query'], self.request.GET.get('cursor')
+        )
         return context
 
 
 class NewsComment(
         LoginRequiredMixin,
+        CommentPageMixin,
         generic.detail.SingleObjectMixin,
         generic.FormView
 ):
@@ -63,11 +215,15 @@ class NewsComment(
         return super().form_valid(form)
 
     def get_success_url(self):
-        post = self.get_object()
-        return reverse('news:detail', kwargs={'pk': post.pk}) + '#comments'
+        return reverse(
+            'news:detail', kwargs={'pk': self.object.pk}
+        ) + '#comments'
 
 
 class NewsDetailView(generic.View):
+    """Страница новости: GET - NewsDetail, POST - NewsComment."""
+    read_from_replica = True
+    cache_version = staticmethod(NewsDetail.cache_version)
 
     def get(self, request, *args, **kwargs):
         view = NewsDetail.as_view()
@@ -83,14 +239,20 @@ class CommentBase(LoginRequiredMixin):
     model = Comment
 
     def get_success_url(self):
-        comment = self.get_object()
+        """Комментарий уже загружен в self.object, новость не нужна."""
         return reverse(
-            'news:detail', kwargs={'pk': comment.news.pk}
+            'news:detail', kwargs={'pk': self.object.news_id}
         ) + '#comments'
 
     def get_queryset(self):
-        """Пользователь может работать только со своими комментариями."""
-        return self.model.objects.filter(author=self.request.user)
+        """
+        Пользователь может работать только со своими комментариями.
+
+        Заголовок новости выводится в шаблонах, поэтому загружаем её сразу.
+        """
+        return self.model.objects.filter(
+            author=self.request.user
+        ).select_related('news')
 
 
 class CommentUpdate(CommentBase, generic.UpdateView):
@@ -102,3 +264,40 @@ class CommentUpdate(CommentBase, generic.UpdateView):
 class CommentDelete(CommentBase, generic.DeleteView):
     """Удаление комментария."""
     template_name = 'news/delete.html'
+
+
+class NewsExport(UserPassesTestMixin, generic.View):
+    """
+    Выгрузка новостей или комментариев для аналитики, только для персонала.
+
+    Параметры: type=news|comments, format=ndjson|csv, since=<id последней
+    полученной строки> для инкрементальной выгрузки только новых строк,
+    gzip=1 для сжатия. Неверные параметры - ответ 400.
+    """
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        kind = request.GET.get('type', 'news')
+        fmt = request.GET.get('format', 'ndjson')
+        if kind not in export.EXPORTS or fmt not in export.CONTENT_TYPES:
+            return HttpResponseBadRequest(
+                'Неизвестный тип или формат выгрузки.'
+            )
+        try:
+            since = int(request.GET.get('since', 0))
+        except ValueError:
+            return HttpResponseBadRequest('Некорректный водяной знак.')
+        gzip = request.GET.get('gzip') == '1'
+        filename = f'{kind}.{fmt}'
+        content_type = export.CONTENT_TYPES[fmt]
+        if gzip:
+            filename += '.gz'
+            content_type = export.GZIP_CONTENT_TYPE
+        response = StreamingHttpResponse(
+            export.export_stream(kind, fmt, since, gzip),
+            content_type=content_type,
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
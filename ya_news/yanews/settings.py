@@ -10,7 +10,11 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = os.getenv('SECRET_KEY', 'secret')
 
-DEBUG = True
+# Боевой профиль: сжатие ответов, статика с хешами в именах файлов,
+# кешированные и заранее загруженные шаблоны, DEBUG выключен.
+PRODUCTION = os.getenv('DJANGO_PRODUCTION') == '1'
+
+DEBUG = not PRODUCTION and os.getenv('DJANGO_DEBUG', '1') == '1'
 
 ALLOWED_HOSTS = ['localhost', '127.0.0.1']
 
@@ -25,6 +29,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'yanews.middleware.QueryStatsMiddleware',
+    'yanews.middleware.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -33,15 +39,30 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
+if PRODUCTION:
+    # Сжимает ответ после всех остальных промежуточных слоёв.
+    MIDDLEWARE.insert(0, 'yanews.middleware.CompressionMiddleware')
 
 ROOT_URLCONF = 'yanews.urls'
 
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+if not DEBUG:
+    # Шаблон читается и разбирается один раз на процесс, а не на каждый
+    # рендеринг; при старте процесса шаблоны загружаются заранее,
+    # см. warmup.py.
+    TEMPLATE_LOADERS = [
+        ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+    ]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -55,13 +76,81 @@ TEMPLATES = [
 WSGI_APPLICATION = 'yanews.wsgi.application'
 
 
+# Профиль SQLite: performance - журнал WAL, настройки SQLITE_PRAGMAS
+# для каждого нового соединения (см. db.py) и постоянные соединения;
+# stock - настройки SQLite и Django по умолчанию.
+SQLITE_PROFILE = os.getenv('SQLITE_PROFILE', 'performance')
+SQLITE_PRAGMAS = {}
+CONN_MAX_AGE = 0
+if SQLITE_PROFILE == 'performance':
+    SQLITE_PRAGMAS = {
+        'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'wal'),
+        # В режиме WAL NORMAL не повреждает БД при сбое питания,
+        # теряются только последние транзакции.
+        'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'normal'),
+        'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+        # Отрицательное значение - размер кеша страниц в КиБ.
+        'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', -64 * 1024)),
+        # Сколько миллисекунд ждать снятия блокировки другим писателем.
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000)),
+    }
+    CONN_MAX_AGE = 60
+# Сколько секунд соединение с БД переиспользуется между запросами.
+CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', CONN_MAX_AGE))
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        # Стандартный бэкенд SQLite с транзакциями BEGIN IMMEDIATE,
+        # см. yanews/sqlite/base.py.
+        'ENGINE': 'yanews.sqlite',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': CONN_MAX_AGE,
+        # Тестовая БД в файле: тестам с потоками нужен режим WAL,
+        # недоступный базе в памяти.
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+    }
+}
+
+# Реплики только для чтения: пути к копиям БД через запятую в DB_REPLICAS.
+# В тестах реплики указывают на тестовую основную БД.
+DATABASE_REPLICAS = []
+for number, path in enumerate(
+    path for path in os.getenv('DB_REPLICAS', '').split(',') if path
+):
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        'NAME': path,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{number}')
+DATABASE_ROUTERS = ['yanews.db.ReplicaRouter']
+# Сколько секунд после записи с основной БД читают пользователь, сделавший
+# запись, и страницы, кешируемые по версии изменённых данных.
+REPLICA_STICKY_TTL = 10
+
+# Кеш общий для всех процессов сервера: через версии в нём процессы
+# узнают об изменении новостей, списка запрещённых слов и пользователей.
+# По умолчанию - файлы в каталоге cache, в боевом окружении - memcached
+# или redis: CACHE_BACKEND и CACHE_LOCATION.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.filebased.FileBasedCache',
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', str(BASE_DIR / 'cache')),
     }
 }
 
+# Сессии читаются из кеша, а записываются и в кеш, и в БД.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+AUTHENTICATION_BACKENDS = ['yanews.auth.CachedModelBackend']
+# Сколько секунд пользователь сессии хранится в памяти процесса.
+AUTH_USER_CACHE_TIMEOUT = 30
+# Сколько пользователей сессии хранится в памяти процесса.
+AUTH_USER_CACHE_SIZE = 1000
+
 
 AUTH_PASSWORD_VALIDATORS = []
 
@@ -77,6 +166,25 @@ USE_L10N = True
 USE_TZ = True
 
 STATIC_URL = '/static/'
+STATIC_ROOT = BASE_DIR / 'static'
+if PRODUCTION:
+    STATICFILES_STORAGE = (
+        'yanews.static.CompressedManifestStaticFilesStorage'
+    )
+
+# Ответы и статические файлы короче, байт, не сжимаются.
+GZIP_MIN_LENGTH = 1024
+GZIP_CONTENT_TYPES = (
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/csv',
+    'text/javascript',
+    'application/javascript',
+    'application/json',
+    'application/x-ndjson',
+    'image/svg+xml',
+)
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -84,3 +192,22 @@ LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('news:home')
 
 NEWS_COUNT_ON_HOME_PAGE = 10
+COMMENTS_COUNT_ON_PAGE = 50
+# Комментариев в одной транзакции массовой модерации.
+COMMENTS_MODERATION_BATCH_SIZE = 1000
+# Новостей в одной пачке пересчёта статистики комментариев.
+NEWS_STATS_BATCH_SIZE = 500
+# Строк, читаемых из БД одним запросом при выгрузке.
+NEWS_EXPORT_CHUNK_SIZE = 2000
+
+# Асинхронные страницы чтения включаются при запуске через ASGI,
+# см. yanews/asgi.py. Синхронный код они выполняют в пуле потоков
+# такого размера.
+NEWS_ASYNC_VIEWS = os.getenv('NEWS_ASYNC_VIEWS') == '1'
+NEWS_ASYNC_THREADS = 16
+
+# Время жизни кешированных фрагментов страниц новостей, в секундах.
+NEWS_CACHE_TIMEOUT = 60 * 60
+
+# Как часто процесс сверяет версию списка запрещённых слов, в секундах.
+BAD_WORDS_CHECK_INTERVAL = 5
@@ -0,0 +1,22 @@
+"""Версии данных в кеше Django: отметки времени их изменения."""
+import time
+
+from django.core.cache import cache
+
+
+def get_version(key):
+    """
+    Текущая версия из кеша Django.
+
+    Версия - отметка времени, а не счётчик: после вытеснения ключа из кеша
+    новая версия не совпадёт ни с одной из старых.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    cache.set(key, time.time_ns(), None)
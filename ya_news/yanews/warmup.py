@@ -0,0 +1,28 @@
+"""Загрузка шаблонов при старте процесса."""
+from pathlib import Path
+
+from django.template import engines
+from django.template.loaders.cached import Loader as CachedLoader
+
+
+def warm_up_templates():
+    """
+    Компилирует шаблоны из DIRS в кеш кешированного загрузчика.
+
+    Первый запрос к странице не тратит время на чтение и разбор
+    шаблонов. Без кешированного загрузчика (DEBUG) ничего не делает.
+    Возвращает число загруженных шаблонов.
+    """
+    count = 0
+    for backend in engines.all():
+        engine = getattr(backend, 'engine', None)
+        if engine is None or not any(
+            isinstance(loader, CachedLoader)
+            for loader in engine.template_loaders
+        ):
+            continue
+        for directory in map(Path, engine.dirs):
+            for path in sorted(directory.rglob('*.html')):
+                engine.get_template(path.relative_to(directory).as_posix())
+                count += 1
+    return count
@@ -0,0 +1,34 @@
+"""
+Замеры производительности YaNote.
+
+Запускаются из каталога ya_note, например:
+python -m benchmarks.slugify
+Каждый замер работает со своей временной тестовой базой данных
+и начинает с пустого кеша.
+"""
+import os
+import time
+
+import django
+
+
+def setup():
+    """Настраивает Django и создаёт временную тестовую БД."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanote.settings')
+    django.setup()
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment(debug=False)
+    connection.creation.create_test_db(verbosity=0)
+    # Версии в общем кеше пережили бы прошлую тестовую БД.
+    cache.clear()
+
+
+def measure(func, repeat=20):
+    """Возвращает среднее время выполнения func в миллисекундах."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
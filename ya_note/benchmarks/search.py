@@ -0,0 +1,80 @@
+"""
+Поиск по заметкам пользователя со 100 тысячами заметок.
+
+python -m benchmarks.search --notes 100000
+
+В базе есть и заметки другого пользователя с теми же словами:
+их индекс отсекает условием на автора.
+"""
+import argparse
+import random
+import time
+from itertools import accumulate
+
+from benchmarks import measure, setup
+
+BATCH_SIZE = 10_000
+ALPHABET = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+
+
+def random_word(rnd):
+    return ''.join(rnd.choice(ALPHABET) for _ in range(rnd.randint(3, 9)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--notes', type=int, default=100_000)
+    args = parser.parse_args()
+    setup()
+    from django.contrib.auth import get_user_model
+
+    from notes.models import Note
+    from notes.search import SearchPage
+
+    rnd = random.Random(0)
+    # Частоты слов убывают по закону Ципфа, как в обычном тексте.
+    vocabulary = [random_word(rnd) for _ in range(20_000)]
+    cum_weights = list(
+        accumulate(1 / rank for rank in range(1, len(vocabulary) + 1))
+    )
+
+    def words(count):
+        return rnd.choices(vocabulary, cum_weights=cum_weights, k=count)
+
+    users = [
+        get_user_model().objects.create(username=f'Пользователь {i}')
+        for i in range(2)
+    ]
+    started = time.perf_counter()
+    for user in users:
+        for offset in range(0, args.notes, BATCH_SIZE):
+            Note.objects.bulk_create(
+                Note(
+                    title=' '.join(words(4)),
+                    text=' '.join(words(60)),
+                    slug=f'{user.pk}-{offset + i}',
+                    author=user,
+                )
+                for i in range(min(BATCH_SIZE, args.notes - offset))
+            )
+    author = users[0]
+    print(
+        f'{args.notes} заметок у каждого из {len(users)} пользователей '
+        f'загружено за {time.perf_counter() - started:.0f} с'
+    )
+    for label, query in (
+        ('самое частое слово', vocabulary[0]),
+        ('слово из середины словаря', vocabulary[1000]),
+        ('редкое слово', vocabulary[-1]),
+        ('два слова', f'{vocabulary[5]} {vocabulary[50]}'),
+    ):
+        page = SearchPage(query, author)
+        found = len(page.object_list)
+        elapsed = measure(
+            lambda: SearchPage(query, author).object_list, repeat=10
+        )
+        print(f'{label}: {elapsed:.1f} мс, на странице {found}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""Транслитерация заголовков заметок: pytils напрямую и с кешем."""
+import random
+
+from pytils.translit import slugify
+
+from benchmarks import measure
+from notes.slugs import slugify_many, slugify_title
+
+TITLES_COUNT = 10_000
+# Заголовки заметок часто повторяются: списки покупок, планы, дневники.
+WORDS = (
+    'список', 'покупок', 'план', 'на', 'неделю', 'идеи', 'для', 'отпуска',
+    'дневник', 'встреча', 'с', 'клиентом', 'заметки', 'по', 'проекту',
+    'рецепт', 'борща', 'книги', 'прочитать', 'фильмы', 'посмотреть',
+    'задачи', 'сегодня', 'завтра', 'отчёт', 'за', 'месяц', 'расходы',
+    'подарки', 'друзьям', 'тренировка', 'английский', 'язык', 'ремонт',
+)
+
+
+def make_titles(rnd):
+    common = [
+        ' '.join(rnd.sample(WORDS, rnd.randint(1, 4))).capitalize()
+        for _ in range(500)
+    ]
+    weights = [1 / rank for rank in range(1, len(common) + 1)]
+    return rnd.choices(common, weights, k=TITLES_COUNT)
+
+
+def main():
+    titles = make_titles(random.Random(0))
+    assert slugify_many(titles) == [slugify(title) for title in titles]
+
+    def cold():
+        slugify_title.cache_clear()
+        slugify_many(titles)
+
+    plain = measure(lambda: [slugify(title) for title in titles], repeat=5)
+    cold_cache = measure(cold, repeat=5)
+    warm_cache = measure(lambda: slugify_many(titles), repeat=5)
+    print(f'{len(titles)} заголовков, уникальных: {len(set(titles))}')
+    print(f'pytils.slugify для каждого: {plain:.1f} мс')
+    print(f'slugify_many, пустой кеш: {cold_cache:.1f} мс')
+    print(f'slugify_many, прогретый кеш: {warm_cache:.1f} мс')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Время разбора и рендеринга шаблонов с кешированным загрузчиком и без.
+
+Разбор - чтение и компиляция шаблона без родительских и включаемых
+шаблонов, их загрузчик без кеша повторяет при каждом рендеринге.
+Контекст берётся из представления списка заметок.
+"""
+from benchmarks import measure, setup
+
+LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def backend(loaders):
+    from django.conf import settings
+    from django.template.backends.django import DjangoTemplates
+
+    options = settings.TEMPLATES[0]
+    return DjangoTemplates({
+        'NAME': 'benchmark',
+        'DIRS': options['DIRS'],
+        'APP_DIRS': False,
+        'OPTIONS': {**options['OPTIONS'], 'loaders': loaders},
+    })
+
+
+def main():
+    setup()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.test import RequestFactory
+
+    from notes.models import Note
+    from notes.views import NotesList
+
+    author = get_user_model().objects.create(username='Автор')
+    Note.objects.bulk_create(
+        Note(
+            title=f'Заметка {i}', text='Текст', slug=f'note-{i}',
+            author=author,
+        )
+        for i in range(settings.NOTES_COUNT_ON_PAGE + 1)
+    )
+    pages = (
+        ('notes/list.html', NotesList.as_view(), {}),
+    )
+    plain = backend(LOADERS)
+    cached = backend([('django.template.loaders.cached.Loader', LOADERS)])
+    print('шаблон             разбор, мс  без кеша, мс  с кешем, мс')
+    for name, view, kwargs in pages:
+        request = RequestFactory().get('/')
+        request.user = author
+        context = view(request, **kwargs).context_data
+        # Первый рендеринг загружает шаблоны в кеш загрузчика.
+        cached.get_template(name).render(context, request)
+        compiled = cached.get_template(name)
+        parsing = measure(lambda: plain.get_template(name), 200)
+        uncached = measure(
+            lambda: plain.get_template(name).render(context, request),
+            200,
+        )
+        rendering = measure(lambda: compiled.render(context, request), 200)
+        print(
+            f'{name:<18} {parsing:>10.3f}  {uncached:>12.3f}  '
+            f'{rendering:>11.3f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,13 @@
+import pytest
+from django.test import override_settings
+
+
+@pytest.fixture(scope='session', autouse=True)
+def shared_cache(tmp_path_factory):
+    """Тесты работают с файловым кешем в своём каталоге."""
+    location = tmp_path_factory.mktemp('cache')
+    with override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(location),
+    }}):
+        yield
@@ -0,0 +1,253 @@
+"""
+Массовый импорт и экспорт заметок.
+
+Файл читается построчно и обрабатывается пачками, выгрузка читает
+заметки из БД порциями, так что ни в одну сторону весь набор заметок
+в памяти не держится.
+"""
+import csv
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from .caching import bump_notes_version
+from .forms import WARNING, NoteForm
+from .models import SLUG_BATCH_SIZE, Note, slug_candidates
+from .slugs import slugify_many
+
+FIELDS = ('title', 'text', 'slug')
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+# Сколько ошибок попадает в отчёт, остальные только считаются.
+MAX_REPORTED_ERRORS = 100
+# Сколько slug проверяется одним запросом IN: в старых версиях SQLite
+# в запросе не больше 999 параметров.
+SLUG_LOOKUP_SIZE = 900
+# Сколько раз пачка вставляется заново, если её slug занял
+# параллельный запрос.
+INSERT_ATTEMPTS = 3
+
+
+def chunked(iterable, size):
+    """Разбивает поток на списки не длиннее size."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def read_rows(lines, fmt):
+    """
+    Записи файла по одной.
+
+    Вместо строки NDJSON, которая не является JSON-объектом,
+    возвращается None.
+    """
+    if fmt == 'csv':
+        yield from csv.DictReader(lines)
+        return
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield row if isinstance(row, dict) else None
+
+
+class ImportResult:
+    """
+    Итог импорта: число созданных заметок и ошибки по номерам записей.
+
+    Если файл не удалось дочитать, read_error - номер записи, на которой
+    остановилось чтение; заметки до неё уже созданы.
+    """
+
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+        self.read_error = None
+
+    def add_error(self, number, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((number, message))
+
+
+def read_until_error(numbered_rows, result):
+    """Записи файла до первой ошибки чтения, она отмечается в result."""
+    number = 0
+    try:
+        for number, row in numbered_rows:
+            yield number, row
+    except (csv.Error, UnicodeDecodeError):
+        result.read_error = number + 1
+
+
+def validate_batch(numbered_rows, author, result):
+    """Проверяет записи формой заметки, не обращаясь к БД."""
+    notes = []
+    for number, row in numbered_rows:
+        if row is None:
+            result.add_error(number, 'Запись не является объектом JSON.')
+            continue
+        form = NoteForm(data={field: row.get(field) for field in FIELDS})
+        if not form.is_valid():
+            result.add_error(number, '; '.join(
+                f'{field}: {" ".join(messages)}'
+                for field, messages in form.errors.items()
+            ))
+            continue
+        note = form.save(commit=False)
+        note.author = author
+        notes.append((number, note))
+    return notes
+
+
+def taken_slugs(slugs):
+    """Какие из slug уже заняты в БД."""
+    taken = set()
+    for chunk in chunked(slugs, SLUG_LOOKUP_SIZE):
+        taken.update(
+            Note.objects.filter(slug__in=chunk).values_list('slug', flat=True)
+        )
+    return taken
+
+
+def assign_slugs(numbered_notes):
+    """
+    Подбирает свободные slug для пачки заметок.
+
+    Пустые slug формируются по заголовку, как в Note.save, но занятость
+    всех вариантов пачки проверяется общим запросом. Возвращает заметки
+    для вставки и номера записей, чей явно указанный slug занят.
+    """
+    max_length = Note._meta.get_field('slug').max_length
+    explicit = [(number, note) for number, note in numbered_notes if note.slug]
+    auto = [note for _, note in numbered_notes if not note.slug]
+    groups = {}
+    for note, base in zip(auto, slugify_many([note.title for note in auto])):
+        groups.setdefault(base[:max_length] or 'note', []).append(note)
+    candidates = {base: slug_candidates(base, max_length) for base in groups}
+
+    # Сначала каждой группе хватает ровно стольких вариантов, сколько в ней
+    # заметок: обычно заголовки свободны, и лишние варианты не проверяются.
+    windows = {
+        base: list(islice(candidates[base], len(group)))
+        for base, group in groups.items()
+    }
+    taken = taken_slugs([
+        *(note.slug for _, note in explicit),
+        *(slug for window in windows.values() for slug in window),
+    ])
+    used = set()
+    notes = []
+    rejected = []
+    for number, note in explicit:
+        if note.slug in taken or note.slug in used:
+            rejected.append((number, note.slug))
+            continue
+        used.add(note.slug)
+        notes.append(note)
+    while groups:
+        for base, window in windows.items():
+            group = groups[base]
+            free = [
+                slug for slug in window
+                if slug not in taken and slug not in used
+            ]
+            for note, slug in zip(group, free):
+                note.slug = slug
+                used.add(slug)
+                notes.append(note)
+            del group[:len(free)]
+        groups = {base: group for base, group in groups.items() if group}
+        windows = {
+            base: list(islice(candidates[base], len(group) + SLUG_BATCH_SIZE))
+            for base, group in groups.items()
+        }
+        taken = taken_slugs(
+            [slug for window in windows.values() for slug in window]
+        )
+    return notes, rejected
+
+
+def insert_batch(numbered_notes, result):
+    """
+    Вставляет пачку заметок одним bulk_create в отдельной транзакции.
+
+    Если slug успели занять параллельно, пачка собирается заново.
+    Пачка, которую не удалось вставить за INSERT_ATTEMPTS попыток,
+    попадает в отчёт ошибкой для каждой записи.
+    """
+    requested = [note.slug for _, note in numbered_notes]
+    for attempt in range(INSERT_ATTEMPTS):
+        notes, rejected = assign_slugs(numbered_notes)
+        try:
+            with transaction.atomic():
+                Note.objects.bulk_create(notes)
+        except IntegrityError:
+            for (_, note), slug in zip(numbered_notes, requested):
+                note.slug = slug
+            continue
+        for number, slug in rejected:
+            result.add_error(number, f'slug: {slug}{WARNING}')
+        result.created += len(notes)
+        return
+    for number, _ in numbered_notes:
+        result.add_error(number, 'Не удалось сохранить заметку.')
+
+
+def import_notes(lines, fmt, author, batch_size=None):
+    """
+    Импортирует заметки автора из строк NDJSON или CSV.
+
+    Каждая пачка из batch_size записей проверяется, получает slug
+    и вставляется отдельно, поэтому созданные до ошибки чтения файла
+    заметки сохраняются, а сама ошибка возвращается в result.read_error.
+    """
+    batch_size = batch_size or settings.NOTES_IMPORT_BATCH_SIZE
+    result = ImportResult()
+    rows = read_until_error(
+        enumerate(read_rows(lines, fmt), start=1), result
+    )
+    try:
+        for batch in chunked(rows, batch_size):
+            notes = validate_batch(batch, author, result)
+            if notes:
+                insert_batch(notes, result)
+    finally:
+        # bulk_create не отправляет сигналы, версию заметок меняем сами.
+        if result.created:
+            bump_notes_version(author.pk)
+    return result
+
+
+class Echo:
+    """Буфер для csv.writer, который сразу возвращает записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def export_notes(queryset, fmt, chunk_size=None):
+    """Строки выгрузки заметок, заметки читаются из БД порциями."""
+    rows = queryset.order_by('id').values_list(*FIELDS).iterator(
+        chunk_size=chunk_size or settings.NOTES_EXPORT_CHUNK_SIZE
+    )
+    if fmt == 'csv':
+        writer = csv.writer(Echo())
+        yield writer.writerow(FIELDS)
+        for row in rows:
+            yield writer.writerow(row)
+        return
+    for row in rows:
+        yield json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False) + '\n'
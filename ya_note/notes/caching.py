@@ -0,0 +1,12 @@
+"""Версии заметок пользователя для условных запросов."""
+from yanote.versions import bump_version, get_version
+
+NOTES_VERSION_KEY = 'notes:{user_id}:version'
+
+
+def notes_version(user_id):
+    return get_version(NOTES_VERSION_KEY.format(user_id=user_id))
+
+
+def bump_notes_version(user_id):
+    bump_version(NOTES_VERSION_KEY.format(user_id=user_id))
@@ -1,6 +1,5 @@
 from django import forms
 from django.core.exceptions import ValidationError
-from pytils.translit import slugify
 
 from .models import Note
 
@@ -14,15 +13,32 @@ class NoteForm(forms.ModelForm):
         model = Note
         fields = ('title', 'text', 'slug')
 
-    def clean_slug(self):
-        """Обрабатывает случай, если slug не уникален."""
-        cleaned_data = super().clean()
-        slug = cleaned_data.get('slug')
-        if not slug:
-            title = cleaned_data.get('title')
-            slug = slugify(title)[:100]
-        if Note.objects.filter(
-                slug=slug
-        ).exclude(id=self.instance.pk).exists():
-            raise ValidationError(slug + WARNING)
-        return slug
+    def validate_unique(self):
+        """
+        Уникальность slug не проверяется отдельным запросом.
+
+        Её обеспечивает ограничение в БД при сохранении, см. Note.save
+        и NoteFormMixin.form_valid.
+        """
+        exclude = [
+            field.name for field in self.instance._meta.fields
+            if field.name not in self._meta.fields
+            or field.name in self.errors
+            or field.name == 'slug'
+        ]
+        try:
+            self.instance.validate_unique(exclude=exclude)
+        except ValidationError as error:
+            self.add_error(None, error)
+
+
+class NotesImportForm(forms.Form):
+    """Файл с заметками для массового импорта."""
+    file = forms.FileField(
+        label='Файл',
+        help_text='По одной заметке в строке NDJSON или в строке CSV',
+    )
+    format = forms.ChoiceField(
+        label='Формат',
+        choices=(('ndjson', 'NDJSON'), ('csv', 'CSV')),
+    )
@@ -0,0 +1,25 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from notes.bulk import CONTENT_TYPES, export_notes
+from notes.models import Note
+
+
+class Command(BaseCommand):
+    help = 'Выгружает заметки пользователя в stdout в NDJSON или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='Автор заметок.')
+        parser.add_argument(
+            '--format', choices=tuple(CONTENT_TYPES), default='ndjson',
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            author = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError('Пользователь не найден.')
+        notes = Note.objects.filter(author=author)
+        for line in export_notes(notes, options['format']):
+            self.stdout.write(line, ending='')
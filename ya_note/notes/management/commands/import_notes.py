@@ -0,0 +1,57 @@
+import sys
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from notes.bulk import CONTENT_TYPES, import_notes
+
+
+class Command(BaseCommand):
+    help = 'Импортирует заметки пользователя из файла NDJSON или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='Автор заметок.')
+        parser.add_argument('path', help='Путь к файлу или - для stdin.')
+        parser.add_argument(
+            '--format', choices=tuple(CONTENT_TYPES),
+            help='Формат файла, по умолчанию определяется по расширению.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int,
+            help='Заметок в одной пачке, по умолчанию '
+                 'NOTES_IMPORT_BATCH_SIZE.',
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            author = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError('Пользователь не найден.')
+        path = options['path']
+        fmt = options['format'] or (
+            'csv' if path.endswith('.csv') else 'ndjson'
+        )
+        started = time.perf_counter()
+        if path == '-':
+            result = import_notes(
+                sys.stdin, fmt, author, options['batch_size']
+            )
+        else:
+            with open(path, encoding='utf-8-sig', newline='') as lines:
+                result = import_notes(
+                    lines, fmt, author, options['batch_size']
+                )
+        for number, message in result.errors:
+            self.stderr.write(f'Запись {number}: {message}')
+        if result.read_error:
+            self.stderr.write(
+                'Не удалось прочитать файл, чтение остановлено '
+                f'на записи {result.read_error}.'
+            )
+        self.stdout.write(
+            f'Создано заметок: {result.created}, '
+            f'с ошибками: {result.failed}, '
+            f'за {time.perf_counter() - started:.1f} с.'
+        )
@@ -1,6 +1,20 @@
+from itertools import count, islice
+
 from django.conf import settings
-from django.db import models
-from pytils.translit import slugify
+from django.db import IntegrityError, models, transaction
+
+from .slugs import slugify_title
+
+# Сколько вариантов slug проверяется одним запросом после конфликта.
+SLUG_BATCH_SIZE = 20
+
+
+def slug_candidates(base, max_length):
+    """Базовый slug, затем варианты с суффиксами -2, -3 и так далее."""
+    yield base
+    for number in count(2):
+        suffix = f'-{number}'
+        yield base[:max_length - len(suffix)] + suffix
 
 
 class Note(models.Model):
@@ -27,11 +41,46 @@ class Note(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        ordering = ('id',)
+        indexes = (
+            models.Index(fields=('author', 'id'), name='note_author_id_idx'),
+        )
+
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            max_slug_length = self._meta.get_field('slug').max_length
-            self.slug = slugify(self.title)[:max_slug_length]
-        super().save(*args, **kwargs)
+        """
+        Сохраняет заметку, подбирая пустой slug по заголовку.
+
+        Уникальность slug проверяет ограничение в БД, а не предварительный
+        запрос, поэтому обычное сохранение - это одна вставка. При конфликте
+        одним запросом IN проверяется пачка вариантов с суффиксами,
+        и вставка повторяется со свободным.
+        """
+        using = kwargs.get('using')
+        if self.slug:
+            with transaction.atomic(using=using):
+                return super().save(*args, **kwargs)
+        max_slug_length = self._meta.get_field('slug').max_length
+        base = slugify_title(self.title)[:max_slug_length] or 'note'
+        candidates = slug_candidates(base, max_slug_length)
+        self.slug = next(candidates)
+        while True:
+            try:
+                with transaction.atomic(using=using):
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                batch = [self.slug, *islice(candidates, SLUG_BATCH_SIZE)]
+                taken = set(
+                    Note.objects.using(using).filter(
+                        slug__in=batch
+                    ).exclude(pk=self.pk).values_list('slug', flat=True)
+                )
+                if self.slug not in taken:
+                    # Конфликт не из-за slug.
+                    raise
+                free = [slug for slug in batch if slug not in taken]
+                if free:
+                    self.slug = free[0]
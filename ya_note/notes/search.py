@@ -0,0 +1,118 @@
+"""
+Полнотекстовый поиск по заметкам пользователя.
+
+Индекс - таблица SQLite FTS5 notes_note_fts с внешним содержимым
+(см. миграцию 0004_search), её обновляют триггеры БД при создании,
+правке и удалении заметки. Автор заметки - тоже столбец индекса,
+и условие на него входит в выражение MATCH: индекс сразу отдаёт
+только заметки пользователя.
+
+Найденные заметки выводятся по возрастанию id, как в списке заметок.
+В этом порядке FTS5 читает списки совпадений и останавливается,
+набрав страницу, поэтому время запроса не зависит от числа совпадений;
+ранжирование bm25 пришлось бы считать для всех совпадений сразу.
+По той же причине слова ищутся целиком: поиск по префиксу объединяет
+списки совпадений всех подходящих слов во всём индексе.
+"""
+import re
+
+from django.conf import settings
+from django.db import connections, router
+from django.http import Http404
+from django.utils.functional import cached_property
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Note
+
+# Границы совпадения в фрагменте, заменяются на <mark> после экранирования.
+MARK_START, MARK_END = '\x02', '\x03'
+SNIPPET_TOKENS = 16
+
+SEARCH_SQL = f'''
+SELECT notes_note_fts.rowid, note.slug,
+       highlight(notes_note_fts, 0, %s, %s),
+       snippet(notes_note_fts, 1, %s, %s, '…', {SNIPPET_TOKENS})
+FROM notes_note_fts
+JOIN notes_note AS note ON note.id = notes_note_fts.rowid
+WHERE notes_note_fts MATCH %s AND notes_note_fts.rowid > %s
+  AND note.author_id = %s
+ORDER BY notes_note_fts.rowid
+LIMIT %s
+'''
+
+
+def match_expression(query, author_id):
+    """
+    Выражение MATCH из строки пользователя.
+
+    Слова берутся в кавычки и ищутся только в заголовке и тексте,
+    обязательное условие на автора ограничивает поиск заметками
+    пользователя.
+    """
+    words = re.findall(r'\w+', query)
+    if not words:
+        return None
+    terms = ' '.join(f'"{word}"' for word in words)
+    return f'author_id : "{int(author_id)}" AND {{title text}} : ({terms})'
+
+
+def mark(fragment):
+    """Экранирует фрагмент и выделяет совпадения тегом <mark>."""
+    return mark_safe(
+        escape(fragment)
+        .replace(MARK_START, '<mark>')
+        .replace(MARK_END, '</mark>')
+    )
+
+
+class SearchResult:
+    def __init__(self, pk, slug, title, snippet):
+        self.pk = pk
+        self.slug = slug
+        self.title = mark(title)
+        self.snippet = mark(snippet)
+
+
+class SearchPage:
+    """
+    Страница результатов поиска.
+
+    Следующая страница выбирается курсором - id последней показанной
+    заметки, а не OFFSET. Запрос выполняется лениво, при первом
+    обращении к результатам.
+    """
+
+    def __init__(self, query, author, cursor=None, size=None):
+        self.match = match_expression(query, author.pk)
+        self.author = author
+        self.size = size or settings.NOTES_COUNT_ON_PAGE
+        self.after = 0
+        if cursor:
+            try:
+                self.after = int(cursor)
+            except ValueError:
+                raise Http404('Некорректный курсор.')
+
+    @cached_property
+    def _results(self):
+        if self.match is None:
+            return []
+        params = (
+            MARK_START, MARK_END, MARK_START, MARK_END,
+            self.match, self.after, self.author.pk,
+            self.size + 1,
+        )
+        with connections[router.db_for_read(Note)].cursor() as cursor:
+            cursor.execute(SEARCH_SQL, params)
+            return [SearchResult(*row) for row in cursor.fetchall()]
+
+    @property
+    def object_list(self):
+        return self._results[:self.size]
+
+    @property
+    def next_cursor(self):
+        if len(self._results) > self.size:
+            return self.object_list[-1].pk
+        return None
@@ -0,0 +1,22 @@
+"""Транслитерация заголовков заметок в slug."""
+from functools import lru_cache
+
+from pytils.translit import slugify
+
+SLUG_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=SLUG_CACHE_SIZE)
+def slugify_title(title):
+    """Slug по заголовку, результаты кешируются в памяти процесса."""
+    return slugify(title)
+
+
+def slugify_many(titles):
+    """
+    Slug для набора заголовков, например при массовом импорте.
+
+    Каждый уникальный заголовок транслитерируется один раз.
+    """
+    slugs = {title: slugify_title(title) for title in set(titles)}
+    return [slugs[title] for title in titles]
@@ -0,0 +1,50 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from yanote import auth
+
+User = get_user_model()
+
+
+class TestCachedAuth(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.url = reverse('notes:add')
+
+    def setUp(self):
+        self.client.force_login(self.author)
+        self.client.get(self.url)
+
+    def test_session_and_user_cached(self):
+        """Повторный запрос не читает из БД ни сессию, ни пользователя"""
+
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_password_change_ends_session(self):
+        """Смена пароля сразу завершает сессию"""
+
+        self.author.set_password('новый-пароль')
+        self.author.save()
+        response = self.client.get(self.url)
+        self.assertRedirects(
+            response, f'{reverse("users:login")}?next={self.url}'
+        )
+
+    @override_settings(AUTH_USER_CACHE_SIZE=2)
+    def test_cached_users_bounded(self):
+        """Давно не запрошенный пользователь вытесняется из памяти процесса"""
+
+        clients = {self.author.pk: self.client}
+        for i in range(2):
+            user = User.objects.create(username=f'Пользователь {i}')
+            clients[user.pk] = Client()
+            clients[user.pk].force_login(user)
+        first, second, third = clients
+        auth._users.clear()
+        for pk in (first, second, first, third):
+            clients[pk].get(self.url)
+        self.assertEqual(list(auth._users), [first, third])
@@ -0,0 +1,217 @@
+import csv
+import io
+import json
+import tempfile
+from http import HTTPStatus
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from pytils.translit import slugify
+
+from notes.bulk import export_notes, import_notes
+from notes.forms import WARNING
+from notes.models import Note
+from notes.tests.test_logic import data_queries
+
+User = get_user_model()
+
+
+def ndjson(rows):
+    return [json.dumps(row, ensure_ascii=False) + '\n' for row in rows]
+
+
+class TestNotesImport(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.existing = Note.objects.create(
+            title='Список покупок',
+            text='Текст',
+            author=cls.author,
+        )
+
+    def test_import_assigns_free_slugs(self):
+        """Пустые slug подбираются с учётом БД и других записей файла"""
+
+        rows = [{'title': 'Список покупок', 'text': 'Текст'}] * 3
+        result = import_notes(ndjson(rows), 'ndjson', self.author)
+        self.assertEqual(result.created, 3)
+        slug = self.existing.slug
+        self.assertEqual(
+            set(Note.objects.values_list('slug', flat=True)),
+            {slug, f'{slug}-2', f'{slug}-3', f'{slug}-4'},
+        )
+
+    def test_import_reports_invalid_rows(self):
+        """Некорректные записи и занятые slug попадают в отчёт"""
+
+        lines = [
+            *ndjson([{'title': 'Первая', 'text': 'Текст'}]),
+            'не json\n',
+            *ndjson([
+                {'title': 'Без текста'},
+                {'title': 'Занятый', 'text': 'Текст', 'slug': 'spisok'},
+                {'title': 'Занятый', 'text': 'Текст',
+                 'slug': self.existing.slug},
+            ]),
+        ]
+        result = import_notes(lines, 'ndjson', self.author)
+        self.assertEqual(result.created, 2)
+        self.assertEqual(result.failed, 3)
+        self.assertEqual([number for number, _ in result.errors], [2, 3, 5])
+        self.assertIn(self.existing.slug + WARNING, result.errors[-1][1])
+
+    def test_import_queries_per_batch(self):
+        """Пачка записей стоит запроса slug и одной вставки"""
+
+        rows = [
+            {'title': f'Заметка {i}', 'text': 'Текст'} for i in range(10)
+        ]
+        with CaptureQueriesContext(connection) as captured:
+            result = import_notes(
+                ndjson(rows), 'ndjson', self.author, batch_size=4
+            )
+        self.assertEqual(result.created, 10)
+        self.assertEqual(len(data_queries(captured)), 3 * 2)
+
+    def test_import_csv_upload(self):
+        """Файл CSV загружается через страницу импорта"""
+
+        content = io.StringIO()
+        writer = csv.writer(content)
+        writer.writerow(('title', 'text', 'slug'))
+        writer.writerow(('Из CSV', 'Текст, с запятой', ''))
+        upload = SimpleUploadedFile(
+            'notes.csv', content.getvalue().encode('utf-8-sig')
+        )
+        self.client.force_login(self.author)
+        response = self.client.post(
+            reverse('notes:import'), {'file': upload, 'format': 'csv'}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.context['result'].created, 1)
+        note = Note.objects.get(slug=slugify('Из CSV'))
+        self.assertEqual(note.text, 'Текст, с запятой')
+        self.assertEqual(note.author, self.author)
+
+    def test_import_upload_reports_read_error(self):
+        """
+        Созданные до ошибки чтения заметки попадают в отчёт
+        вместе с номером записи, на которой чтение остановилось
+        """
+
+        content = ''.join(ndjson([
+            {'title': 'Первая', 'text': 'Текст'},
+            {'title': 'Вторая', 'text': 'Текст'},
+        ])).encode() + b'\xff\n'
+        self.client.force_login(self.author)
+        response = self.client.post(reverse('notes:import'), {
+            'file': SimpleUploadedFile('notes.ndjson', content),
+            'format': 'ndjson',
+        })
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.context['result'].created, 2)
+        self.assertEqual(response.context['result'].read_error, 3)
+        self.assertIn(
+            'на записи 3', response.context['form'].errors['file'][0]
+        )
+        self.assertTrue(Note.objects.filter(title='Вторая').exists())
+
+    def test_import_command(self):
+        """Команда import_notes читает файл с диска"""
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / 'notes.ndjson'
+        path.write_text(''.join(ndjson([{'title': 'Из файла', 'text': 'Т'}])))
+        out = io.StringIO()
+        call_command('import_notes', self.author.username, str(path),
+                     stdout=out)
+        self.assertIn('Создано заметок: 1', out.getvalue())
+        self.assertTrue(Note.objects.filter(title='Из файла').exists())
+
+
+class TestNotesImportFailure(TransactionTestCase):
+
+    def test_failed_insert_reported_per_row(self):
+        """
+        Пачка, которую не удалось вставить, попадает в отчёт ошибками
+        записей, а не исключением
+        """
+
+        author = User.objects.create(username='Автор')
+        User.objects.filter(pk=author.pk).delete()
+        rows = [{'title': f'Заметка {i}', 'text': 'Текст'} for i in range(3)]
+        result = import_notes(ndjson(rows), 'ndjson', author)
+        self.assertEqual(result.created, 0)
+        self.assertEqual([number for number, _ in result.errors], [1, 2, 3])
+        self.assertFalse(Note.objects.exists())
+
+
+class TestNotesExport(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.reader = User.objects.create(username='Читатель')
+        for user in (cls.author, cls.reader):
+            Note.objects.bulk_create(
+                Note(
+                    title=f'Заголовок {i}',
+                    text='Текст, "в кавычках"',
+                    slug=f'{user.pk}-{i}',
+                    author=user,
+                )
+                for i in range(5)
+            )
+
+    def test_export_streams_own_notes(self):
+        """Выгрузка отдаётся потоком и содержит только заметки автора"""
+
+        self.client.force_login(self.author)
+        for fmt in ('ndjson', 'csv'):
+            with self.subTest(fmt=fmt):
+                response = self.client.get(
+                    reverse('notes:export'), {'format': fmt}
+                )
+                self.assertTrue(response.streaming)
+                content = b''.join(response.streaming_content).decode()
+                lines = io.StringIO(content)
+                if fmt == 'csv':
+                    rows = list(csv.DictReader(lines))
+                else:
+                    rows = [json.loads(line) for line in lines]
+                self.assertEqual(
+                    [row['slug'] for row in rows],
+                    [f'{self.author.pk}-{i}' for i in range(5)],
+                )
+
+    def test_export_unknown_format(self):
+        """Неизвестный формат выгрузки - ошибка 404"""
+
+        self.client.force_login(self.author)
+        response = self.client.get(reverse('notes:export'), {'format': 'x'})
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_export_import_round_trip(self):
+        """Выгруженные заметки импортируются другому пользователю"""
+
+        notes = Note.objects.filter(author=self.author)
+        lines = [
+            line.replace(f'"{self.author.pk}-', '"copy-')
+            for line in export_notes(notes, 'ndjson', chunk_size=2)
+        ]
+        result = import_notes(lines, 'ndjson', self.reader)
+        self.assertEqual(result.created, 5)
+        self.assertEqual(
+            list(Note.objects.filter(author=self.reader, slug__startswith='c')
+                 .values_list('text', flat=True)),
+            ['Текст, "в кавычках"'] * 5,
+        )
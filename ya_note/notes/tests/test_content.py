@@ -1,5 +1,11 @@
+import os
+import subprocess
+import sys
+from http import HTTPStatus
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from notes.models import Note
@@ -50,3 +56,83 @@ class TestContent(TestCase):
                 url = reverse(page, args=args)
                 response = self.client.get(url)
                 self.assertIn('form', response.context)
+
+    def test_conditional_get(self):
+        """
+        Неизменившиеся список и заметка отдаются ответом 304
+        без запросов к заметкам, изменение заметки меняет ETag
+        """
+        self.client.force_login(self.author)
+        for url in (
+            reverse('notes:list'),
+            reverse('notes:detail', args=(self.note.slug,)),
+        ):
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                # Сессия и пользователь уже в кеше.
+                with self.assertNumQueries(0):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+                self.note.save()
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_etag_shared_between_processes(self):
+        """
+        Новую версию заметок из другого процесса видят все процессы:
+        прежний ETag перестаёт подходить
+        """
+        self.client.force_login(self.author)
+        url = reverse('notes:list')
+        etag = self.client.get(url)['ETag']
+        cache = settings.CACHES['default']
+        subprocess.run(
+            (
+                sys.executable, '-c',
+                'import django; django.setup(); '
+                'from notes.caching import bump_notes_version; '
+                f'bump_notes_version({self.author.pk})',
+            ),
+            cwd=settings.BASE_DIR,
+            env={
+                **os.environ,
+                'DJANGO_SETTINGS_MODULE': 'yanote.settings',
+                'CACHE_BACKEND': cache['BACKEND'],
+                'CACHE_LOCATION': cache['LOCATION'],
+            },
+            check=True,
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    @override_settings(NOTES_COUNT_ON_PAGE=2)
+    def test_notes_list_keyset_pagination(self):
+        """
+        Заметки выводятся по возрастанию id страницами,
+        каждая страница стоит одинаковое число запросов
+        """
+        Note.objects.bulk_create(
+            Note(title='Заголовок', text='Текст', slug=i, author=self.author)
+            for i in range(5)
+        )
+        self.client.force_login(self.author)
+        url = reverse('notes:list')
+        # Пользователь после входа загружается один раз и кешируется.
+        self.client.get(url)
+        notes, data = [], {}
+        while True:
+            with self.assertNumQueries(1):
+                response = self.client.get(url, data)
+            notes += response.context['object_list']
+            if response.context['next_cursor'] is None:
+                break
+            data = {'cursor': response.context['next_cursor']}
+        self.assertEqual(
+            notes, list(Note.objects.filter(author=self.author).order_by('id'))
+        )
+
+    def test_notes_list_invalid_cursor(self):
+        """Для испорченного курсора возвращается ошибка 404"""
+        self.client.force_login(self.author)
+        response = self.client.get(reverse('notes:list'), {'cursor': 'x'})
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
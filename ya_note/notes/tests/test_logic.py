@@ -1,16 +1,28 @@
+import threading
 from http import HTTPStatus
 
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.db import IntegrityError, connection
+from django.test import Client, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from pytils.translit import slugify
 
 from notes.forms import WARNING
 from notes.models import Note
+from notes.slugs import slugify_many, slugify_title
 
 User = get_user_model()
 
 
+def data_queries(captured):
+    """Запросы без служебных команд точек сохранения."""
+    return [
+        query['sql'] for query in captured.captured_queries
+        if not query['sql'].startswith(('SAVEPOINT', 'RELEASE SAVEPOINT'))
+    ]
+
+
 class TestNoteCreation(TestCase):
 
     @classmethod
@@ -38,6 +50,17 @@ class TestNoteCreation(TestCase):
         self.assertEqual(note.text, self.form_data['text'])
         self.assertEqual(note.slug, self.form_data['slug'])
 
+    def test_create_note_query_count(self):
+        """
+        Создание заметки: одна вставка без предварительной проверки
+        slug и повторного сохранения, сессия и пользователь в кеше
+        """
+
+        self.author_client.get(self.add_url)
+        with CaptureQueriesContext(connection) as captured:
+            self.author_client.post(self.add_url, data=self.form_data)
+        self.assertEqual(len(data_queries(captured)), 1)
+
     def test_anonymous_user_cant_create_note(self):
         """Анонимный пользователь не может создать заметку"""
 
@@ -62,6 +85,21 @@ class TestNoteCreation(TestCase):
             errors=warning
         )
 
+    def test_other_conflict_with_empty_slug(self):
+        """Конфликт не из-за slug не выдаётся за занятый slug"""
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE TEMP TRIGGER reject_note BEFORE INSERT ON notes_note '
+                "BEGIN SELECT RAISE(ABORT, 'заметка отклонена'); END"
+            )
+        self.addCleanup(
+            connection.cursor().execute, 'DROP TRIGGER reject_note'
+        )
+        self.form_data.pop('slug')
+        with self.assertRaises(IntegrityError):
+            self.author_client.post(self.add_url, data=self.form_data)
+
     def test_empty_slug(self):
         """
         Если при создании заметки не заполнен slug,
@@ -78,6 +116,78 @@ class TestNoteCreation(TestCase):
         note_slug = Note.objects.get(slug=expected_slug)
         self.assertEqual(note_slug.slug, expected_slug)
 
+    def test_empty_slug_taken(self):
+        """
+        Если slug, сформированный из заголовка, занят,
+        к нему добавляется числовой суффикс
+        """
+
+        self.form_data.pop('slug')
+        for _ in range(3):
+            self.author_client.post(self.add_url, data=self.form_data)
+        slug = slugify(self.form_data['title'])
+        self.assertEqual(
+            set(Note.objects.values_list('slug', flat=True)),
+            {slug, f'{slug}-2', f'{slug}-3'},
+        )
+
+    def test_slug_transliterated_once(self):
+        """Заголовок транслитерируется один раз на запрос"""
+
+        self.form_data.pop('slug')
+        slugify_title.cache_clear()
+        self.author_client.post(self.add_url, data=self.form_data)
+        self.author_client.post(self.add_url, data=self.form_data)
+        info = slugify_title.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 1))
+
+    def test_slugify_many(self):
+        """slugify_many совпадает с pytils и сохраняет порядок"""
+
+        titles = ['Список покупок', 'План', 'Список покупок', '']
+        self.assertEqual(
+            slugify_many(titles), [slugify(title) for title in titles]
+        )
+
+
+class TestConcurrentSlugs(TransactionTestCase):
+    THREADS_COUNT = 8
+
+    def test_same_title_in_parallel(self):
+        """
+        Заметки с одинаковым заголовком, созданные одновременно,
+        получают разные slug без ошибок
+        """
+
+        author = User.objects.create(username='Автор')
+        barrier = threading.Barrier(self.THREADS_COUNT)
+        errors = []
+
+        def create_note():
+            try:
+                barrier.wait()
+                Note.objects.create(
+                    title='Одинаковый заголовок',
+                    text='Текст',
+                    author=author,
+                )
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=create_note)
+            for _ in range(self.THREADS_COUNT)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        slugs = set(Note.objects.values_list('slug', flat=True))
+        self.assertEqual(len(slugs), self.THREADS_COUNT)
+
 
 class TestNoteEditDelete(TestCase):
     NEW_NOTE_TITLE = 'Новый заголовок'
@@ -113,6 +223,24 @@ class TestNoteEditDelete(TestCase):
         self.assertEqual(self.note.title, self.NEW_NOTE_TITLE)
         self.assertEqual(self.note.text, self.NEW_NOTE_TEXT)
 
+    def test_edit_note_query_count(self):
+        """
+        Заметка загружается один раз,
+        slug не проверяется отдельным запросом
+        """
+
+        self.author_client.get(self.edit_note)
+        with CaptureQueriesContext(connection) as captured:
+            self.author_client.post(self.edit_note, self.form_data)
+        self.assertEqual(len(data_queries(captured)), 2)
+
+    def test_delete_note_query_count(self):
+        """Заметка загружается один раз перед удалением"""
+
+        self.author_client.get(self.delete_note)
+        with self.assertNumQueries(2):
+            self.author_client.post(self.delete_note)
+
     def test_other_user_cant_edit_note(self):
         """Пользователь не может редактировать чужую заметку"""
 
@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from notes import urls
+from notes.models import Note
+from yanote.middleware import QueryStats
+
+User = get_user_model()
+
+# Маршрут: (нужен ли slug заметки, допустимое число SQL-запросов).
+# Один запрос из бюджета уходит на пользователя, сессия читается из кеша.
+QUERY_BUDGETS = {
+    'notes:home': (False, 1),
+    'notes:add': (False, 1),
+    'notes:edit': (True, 2),
+    'notes:detail': (True, 2),
+    'notes:delete': (True, 2),
+    'notes:list': (False, 2),
+    'notes:success': (False, 1),
+    'notes:search': (False, 1),
+    'notes:import': (False, 1),
+    'notes:export': (False, 2),
+}
+
+
+class TestQueryBudgets(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.note = Note.objects.create(
+            title='Заголовок',
+            text='Текст',
+            author=cls.author,
+        )
+
+    def setUp(self):
+        self.client.force_login(self.author)
+
+    def test_every_route_has_budget(self):
+        """Для каждого маршрута приложения задан бюджет запросов"""
+
+        names = {
+            f'{urls.app_name}:{pattern.name}'
+            for pattern in urls.urlpatterns
+        }
+        self.assertEqual(names, set(QUERY_BUDGETS))
+
+    def test_routes_fit_query_budget(self):
+        """Страницы укладываются в бюджет и не повторяют запросы"""
+
+        for name, (with_slug, budget) in QUERY_BUDGETS.items():
+            with self.subTest(name=name):
+                args = (self.note.slug,) if with_slug else None
+                url = reverse(name, args=args)
+                with QueryStats() as stats:
+                    response = self.client.get(url)
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                self.assertLessEqual(stats.count, budget)
+                self.assertEqual(stats.duplicates, 0)
+
+    def test_query_stats_headers(self):
+        """Заголовки со статистикой SQL добавляются только в режиме отладки"""
+
+        url = reverse('notes:list')
+        for debug in (True, False):
+            with self.subTest(debug=debug), override_settings(DEBUG=debug):
+                response = self.client.get(url)
+                self.assertEqual(response.has_header('X-Query-Count'), debug)
@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from notes.models import Note
+
+User = get_user_model()
+
+
+def query_plan(sql):
+    """Шаги плана выполнения запроса в SQLite."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def is_slow_step(step):
+    """Полный просмотр таблицы или сортировка во временном B-дереве."""
+    full_scan = step.startswith('SCAN') and ' USING ' not in step
+    return full_scan or 'TEMP B-TREE' in step
+
+
+class TestQueryPlans(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.reader = User.objects.create(username='Читатель')
+        for user in (cls.author, cls.reader):
+            Note.objects.bulk_create(
+                Note(
+                    title=f'Заголовок {i}',
+                    text='Текст',
+                    slug=f'{user.pk}-{i}',
+                    author=user,
+                )
+                for i in range(5)
+            )
+        cls.note = Note.objects.filter(author=cls.author).first()
+
+    def test_pages_use_indexes(self):
+        """Запросы страниц не просматривают таблицы целиком и не сортируют"""
+
+        self.client.force_login(self.author)
+        for name, args in (
+            ('notes:list', None),
+            ('notes:add', None),
+            ('notes:success', None),
+            ('notes:detail', (self.note.slug,)),
+            ('notes:edit', (self.note.slug,)),
+            ('notes:delete', (self.note.slug,)),
+            ('notes:import', None),
+            ('notes:export', None),
+        ):
+            with self.subTest(name=name):
+                url = reverse(name, args=args)
+                with CaptureQueriesContext(connection) as captured:
+                    response = self.client.get(url)
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                for query in captured.captured_queries:
+                    if not query['sql'].startswith('SELECT'):
+                        continue
+                    slow_steps = [
+                        step for step in query_plan(query['sql'])
+                        if is_slow_step(step)
+                    ]
+                    self.assertEqual(slow_steps, [], query['sql'])
@@ -0,0 +1,99 @@
+import tempfile
+from http import HTTPStatus
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from notes.caching import bump_notes_version
+from notes.models import Note
+from yanote.db import STICKY_COOKIE
+
+User = get_user_model()
+
+REPLICA = 'replica'
+
+
+class TestReplicas(TestCase):
+    """Реплика - отдельный файл SQLite со своими данными."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        connections.databases[REPLICA] = {
+            **connections.databases['default'],
+            'NAME': str(Path(directory.name) / 'replica.sqlite3'),
+        }
+        self.addCleanup(self.remove_replica)
+        settings = override_settings(DATABASE_REPLICAS=[REPLICA])
+        settings.enable()
+        self.addCleanup(settings.disable)
+        call_command('migrate', database=REPLICA, verbosity=0)
+
+        self.author = User.objects.create(username='Автор')
+        self.client.force_login(self.author)
+        # На реплике тот же автор, но заметки другие.
+        User.objects.using(REPLICA).create(
+            pk=self.author.pk, username='Автор'
+        )
+        Note.objects.using(REPLICA).create(
+            pk=10 ** 6, title='С реплики', text='Текст', slug='replica',
+            author_id=self.author.pk,
+        )
+        self.note = Note.objects.create(
+            title='С основной', text='Текст', slug='primary',
+            author=self.author,
+        )
+
+    def remove_replica(self):
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.databases[REPLICA]
+
+    # Версия заметок старше окна отставания реплики.
+    @override_settings(REPLICA_STICKY_TTL=0)
+    def test_read_views_use_replica(self):
+        """Список и страница заметки читаются с реплики, правка - нет"""
+
+        response = self.client.get(reverse('notes:list'))
+        self.assertContains(response, 'С реплики')
+        self.assertNotContains(response, 'С основной')
+        for name, status in (
+            ('notes:detail', HTTPStatus.NOT_FOUND),
+            ('notes:edit', HTTPStatus.OK),
+        ):
+            with self.subTest(name=name):
+                url = reverse(name, args=(self.note.slug,))
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status)
+
+    def test_primary_after_write(self):
+        """После записи пользователь читает с основной БД"""
+
+        url = reverse('notes:edit', args=(self.note.slug,))
+        response = self.client.post(
+            url, {'title': 'Новый заголовок', 'text': 'Текст', 'slug': 'new'}
+        )
+        self.assertRedirects(response, reverse('notes:success'))
+        self.assertIn(STICKY_COOKIE, response.cookies)
+        response = self.client.get(reverse('notes:list'))
+        self.assertContains(response, 'Новый заголовок')
+        del self.client.cookies[STICKY_COOKIE]
+        with override_settings(REPLICA_STICKY_TTL=0):
+            response = self.client.get(reverse('notes:list'))
+        self.assertNotContains(response, 'Новый заголовок')
+
+    def test_primary_while_version_is_young(self):
+        """
+        Пока версия заметок моложе окна отставания реплики, список
+        читается с основной БД и ETag новой версии не получает старые данные
+        """
+        bump_notes_version(self.author.pk)
+        response = self.client.get(reverse('notes:list'))
+        self.assertContains(response, 'С основной')
+        with override_settings(REPLICA_STICKY_TTL=0):
+            response = self.client.get(reverse('notes:list'))
+        self.assertContains(response, 'С реплики')
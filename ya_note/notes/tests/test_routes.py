@@ -82,6 +82,8 @@ class TestRoutes(TestCase):
             ('notes:edit', (self.note.slug,)),
             ('notes:delete', (self.note.slug,)),
             ('notes:detail', (self.note.slug,)),
+            ('notes:import', None),
+            ('notes:export', None),
         ):
             with self.subTest(name=name):
                 url = reverse(name, args=args)
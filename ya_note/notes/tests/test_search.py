@@ -0,0 +1,103 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from notes.models import Note
+from notes.search import SEARCH_SQL, match_expression
+
+User = get_user_model()
+
+
+class TestSearch(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.reader = User.objects.create(username='Читатель')
+        cls.in_title = Note.objects.create(
+            title='Рецепт борща', text='Свёкла и капуста', author=cls.author,
+        )
+        cls.in_text = Note.objects.create(
+            title='Покупки', text='Продукты для борща', author=cls.author,
+        )
+        Note.objects.create(
+            title='Борща читателю', text='Чужая заметка', author=cls.reader,
+        )
+        cls.url = reverse('notes:search')
+
+    def setUp(self):
+        self.client.force_login(self.author)
+
+    def search(self, query, **params):
+        response = self.client.get(self.url, {'q': query, **params})
+        return response.context['results']
+
+    def test_search_own_notes(self):
+        """
+        Находятся только свои заметки по порядку id,
+        совпадения выделены
+        """
+        results = self.search('Борща').object_list
+        self.assertEqual(
+            [note.slug for note in results],
+            [self.in_title.slug, self.in_text.slug],
+        )
+        self.assertIn('<mark>борща</mark>', results[0].title)
+        self.assertIn('<mark>борща</mark>', results[1].snippet)
+
+    @override_settings(NOTES_COUNT_ON_PAGE=1)
+    def test_search_pages(self):
+        """Следующая страница выбирается курсором"""
+
+        first_page = self.search('борща')
+        second_page = self.search('борща', cursor=first_page.next_cursor)
+        self.assertEqual(second_page.object_list[0].slug, self.in_text.slug)
+        self.assertIsNone(second_page.next_cursor)
+
+    def test_index_follows_views(self):
+        """Индекс обновляется при создании, правке и удалении заметки"""
+
+        self.client.post(reverse('notes:add'), {
+            'title': 'Окрошка', 'text': 'Квас', 'slug': 'okroshka',
+        })
+        self.assertEqual(len(self.search('квас').object_list), 1)
+        self.client.post(reverse('notes:edit', args=('okroshka',)), {
+            'title': 'Окрошка', 'text': 'Кефир', 'slug': 'okroshka',
+        })
+        self.assertEqual(self.search('квас').object_list, [])
+        self.assertEqual(len(self.search('кефир').object_list), 1)
+        self.client.post(reverse('notes:delete', args=('okroshka',)))
+        self.assertEqual(self.search('кефир').object_list, [])
+
+    def test_user_input_is_escaped(self):
+        """Синтаксис FTS5 и HTML в запросе и заметке безопасны"""
+
+        Note.objects.create(
+            title='<script>', text='<b>Текст</b>', author=self.author,
+        )
+        self.assertEqual(self.search('author_id : 1 OR *').object_list, [])
+        results = self.search('script')
+        self.assertIn(
+            '&lt;<mark>script</mark>&gt;', results.object_list[0].title
+        )
+
+    def test_author_filter_in_match(self):
+        """
+        Условие на автора проверяется самим индексом FTS5,
+        результаты идут в порядке индекса без сортировки
+        """
+        match = match_expression('борща', self.reader.pk)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT rowid FROM notes_note_fts WHERE notes_note_fts '
+                'MATCH %s', (match,)
+            )
+            self.assertEqual(len(cursor.fetchall()), 1)
+            cursor.execute(
+                f'EXPLAIN QUERY PLAN {SEARCH_SQL}',
+                ('', '', '', '', match, 0, self.reader.pk, 10),
+            )
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        self.assertIn('VIRTUAL TABLE INDEX', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
@@ -0,0 +1,67 @@
+import gzip
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from yanote import static
+from yanote.middleware import CompressionMiddleware
+
+
+class TestStatic(SimpleTestCase):
+
+    def test_compression_threshold(self):
+        """Сжимаются только текстовые ответы не короче порога"""
+
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        cases = (
+            ('text/html; charset=utf-8', 4096, True),
+            ('text/html; charset=utf-8', 512, False),
+            ('application/gzip', 4096, False),
+        )
+        for content_type, size, compressed in cases:
+            with self.subTest(content_type=content_type, size=size):
+                response = CompressionMiddleware(
+                    lambda request: HttpResponse(
+                        b'a' * size, content_type=content_type
+                    )
+                )(request)
+                self.assertEqual(
+                    response.has_header('Content-Encoding'), compressed
+                )
+
+    def test_collectstatic_and_serve(self):
+        """
+        collectstatic сохраняет сжатые копии файлов с хешем в имени,
+        они отдаются с кешированием навсегда
+        """
+        with tempfile.TemporaryDirectory() as root, override_settings(
+            STATIC_ROOT=root,
+            STATICFILES_STORAGE=(
+                'yanote.static.CompressedManifestStaticFilesStorage'
+            ),
+        ):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            manifest = json.loads(
+                (Path(root) / 'staticfiles.json').read_text()
+            )
+            hashed = manifest['paths']['admin/css/base.css']
+            self.assertEqual(
+                gzip.decompress((Path(root) / f'{hashed}.gz').read_bytes()),
+                (Path(root) / hashed).read_bytes(),
+            )
+            request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+            response = static.serve(request, hashed)
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertFalse(response.has_header('Content-Disposition'))
+            self.assertIn('immutable', response['Cache-Control'])
+            response.close()
+            request = RequestFactory().get(
+                '/', HTTP_ACCEPT_ENCODING='gzip;q=0'
+            )
+            response = static.serve(request, hashed)
+            self.assertFalse(response.has_header('Content-Encoding'))
+            response.close()
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.template import engines
+from django.test import SimpleTestCase, override_settings
+
+from yanote.warmup import warm_up_templates
+
+LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def templates(loaders):
+    return [{
+        **settings.TEMPLATES[0],
+        'OPTIONS': {**settings.TEMPLATES[0]['OPTIONS'], 'loaders': loaders},
+    }]
+
+
+class TestWarmUp(SimpleTestCase):
+
+    def test_warm_up_fills_cached_loader(self):
+        """Шаблоны проекта загружаются в кеш при старте процесса"""
+
+        cached = [('django.template.loaders.cached.Loader', LOADERS)]
+        with override_settings(TEMPLATES=templates(cached)):
+            loader = engines['django'].engine.template_loaders[0]
+            self.assertGreater(warm_up_templates(), 0)
+            for name in ('notes/list.html', 'notes/form.html', 'base.html'):
+                self.assertIn(name, loader.get_template_cache)
+
+    def test_warm_up_skipped_without_cached_loader(self):
+        """Без кешированного загрузчика шаблоны заранее не загружаются"""
+
+        with override_settings(TEMPLATES=templates(LOADERS)):
+            self.assertEqual(warm_up_templates(), 0)
@@ -1,9 +1,32 @@
+import codecs
+import hashlib
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import IntegrityError
+from django.http import Http404, StreamingHttpResponse
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
 from django.views import generic
+from django.views.decorators.http import condition
 
-from .forms import NoteForm
+from . import bulk
+from .caching import notes_version
+from .forms import WARNING, NoteForm, NotesImportForm
 from .models import Note
+from .search import SearchPage
+
+
+def notes_etag(request, *args, **kwargs):
+    """
+    Заметки пользователя меняются вместе с их версией в кеше.
+
+    Анонима страницы перенаправляют на вход, ETag ему не нужен.
+    """
+    if not request.user.is_authenticated:
+        return None
+    parts = (notes_version(request.user.pk), request.get_full_path())
+    return hashlib.md5(':'.join(map(str, parts)).encode()).hexdigest()
 
 
 class Home(generic.TemplateView):
@@ -21,27 +44,51 @@ class NoteBase(LoginRequiredMixin):
     model = Note
     success_url = reverse_lazy('notes:success')
 
+    @staticmethod
+    def cache_version(request, **kwargs):
+        """Версия заметок пользователя, по которой считается ETag."""
+        if not request.user.is_authenticated:
+            return None
+        return notes_version(request.user.pk)
+
     def get_queryset(self):
         """Пользователь может работать только со своими заметками."""
         return self.model.objects.filter(author=self.request.user)
 
 
-class NoteCreate(NoteBase, generic.CreateView):
-    """Добавление заметки."""
+class NoteFormMixin:
+    """Сохранение заметки через форму."""
     template_name = 'notes/form.html'
     form_class = NoteForm
 
     def form_valid(self, form):
-        new_note = form.save(commit=False)
-        new_note.author = self.request.user
-        new_note.save()
+        """
+        Занятый slug обнаруживается ограничением уникальности в БД.
+
+        Пустой slug Note.save подбирает сам, конфликт при нём - не из-за
+        slug, и ошибка не подменяется.
+        """
+        slug = form.cleaned_data['slug']
+        try:
+            return super().form_valid(form)
+        except IntegrityError:
+            if not slug:
+                raise
+            form.add_error('slug', slug + WARNING)
+            return self.form_invalid(form)
+
+
+class NoteCreate(NoteBase, NoteFormMixin, generic.CreateView):
+    """Добавление заметки."""
+
+    def form_valid(self, form):
+        """Заметка сохраняется один раз, в родительском form_valid."""
+        form.instance.author = self.request.user
         return super().form_valid(form)
 
 
-class NoteUpdate(NoteBase, generic.UpdateView):
+class NoteUpdate(NoteBase, NoteFormMixin, generic.UpdateView):
     """Редактирование заметки."""
-    template_name = 'notes/form.html'
-    form_class = NoteForm
 
 
 class NoteDelete(NoteBase, generic.DeleteView):
@@ -49,11 +96,95 @@ class NoteDelete(NoteBase, generic.DeleteView):
     template_name = 'notes/delete.html'
 
 
+@method_decorator(condition(etag_func=notes_etag), name='dispatch')
 class NotesList(NoteBase, generic.ListView):
-    """Список всех заметок пользователя."""
-    template_name = 'notes/list.html'
+    """
+    Список заметок пользователя.
 
+    Заметки выводятся по возрастанию id страницами, следующая страница
+    выбирается курсором ?cursor=<id последней заметки>, а не OFFSET.
+    """
+    template_name = 'notes/list.html'
+    read_from_replica = True
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        cursor = self.request.GET.get('cursor')
+        if cursor:
+            try:
+                queryset = queryset.filter(pk__gt=int(cursor))
+            except ValueError:
+                raise Http404('Некорректный курсор.')
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        size = settings.NOTES_COUNT_ON_PAGE
+        # Лишняя заметка показывает, есть ли следующая страница.
+        notes = list(self.object_list[:size + 1])
+        context = super().get_context_data(object_list=notes[:size], **kwargs)
+        context['next_cursor'] = None
+        if len(notes) > size:
+            context['next_cursor'] = notes[size - 1].pk
+        return context
+
+
+@method_decorator(condition(etag_func=notes_etag), name='dispatch')
 class NoteDetail(NoteBase, generic.DetailView):
     """Заметка подробно."""
     template_name = 'notes/detail.html'
+    read_from_replica = True
+
+
+@method_decorator(condition(etag_func=notes_etag), name='dispatch')
+class NotesSearch(LoginRequiredMixin, generic.TemplateView):
+    """Поиск по заголовкам и текстам заметок пользователя."""
+    template_name = 'notes/search.html'
+    read_from_replica = True
+    cache_version = staticmethod(NoteBase.cache_version)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.request.GET.get('q', '').strip()
+        context['results'] = SearchPage(
+            context['query'], self.request.user,
+            self.request.GET.get('cursor'),
+        )
+        return context
+
+
+class NotesImport(LoginRequiredMixin, generic.FormView):
+    """Массовый импорт заметок из файла."""
+    template_name = 'notes/import.html'
+    form_class = NotesImportForm
+
+    def form_valid(self, form):
+        """Загруженный файл читается построчно, а не целиком."""
+        lines = codecs.iterdecode(form.cleaned_data['file'], 'utf-8-sig')
+        result = bulk.import_notes(
+            lines, form.cleaned_data['format'], self.request.user
+        )
+        if result.read_error:
+            form.add_error('file', (
+                'Не удалось прочитать файл, чтение остановлено '
+                f'на записи {result.read_error}.'
+            ))
+        return self.render_to_response(
+            self.get_context_data(form=form, result=result)
+        )
+
+
+class NotesExport(NoteBase, generic.View):
+    """Выгрузка заметок пользователя потоком в NDJSON или CSV."""
+
+    def get(self, request, *args, **kwargs):
+        fmt = request.GET.get('format', 'ndjson')
+        if fmt not in bulk.CONTENT_TYPES:
+            raise Http404('Неизвестный формат.')
+        response = StreamingHttpResponse(
+            bulk.export_notes(self.get_queryset(), fmt),
+            content_type=bulk.CONTENT_TYPES[fmt],
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="notes.{fmt}"'
+        )
+        return response
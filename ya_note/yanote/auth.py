@@ -0,0 +1,77 @@
+"""
+Аутентификация без запроса пользователя к БД на каждый запрос.
+
+Пользователь сессии хранится в памяти процесса не дольше
+AUTH_USER_CACHE_TIMEOUT секунд; больше AUTH_USER_CACHE_SIZE
+пользователей процесс не держит, давно не запрошенные вытесняются.
+Версия пользователя хранится в кеше Django и меняется при сохранении,
+удалении и выходе пользователя, в том числе при смене пароля.
+
+Новую версию сразу видят все процессы, только если кеш у них общий
+(см. CACHES). С кешем в памяти процесса остальные процессы отдают
+прежнего пользователя ещё до AUTH_USER_CACHE_TIMEOUT секунд.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+
+from .versions import bump_version, get_version
+
+USER_VERSION_KEY = 'auth:user:{pk}:version'
+
+# id пользователя: (пользователь, версия, срок годности), от давно
+# не запрошенных к недавним.
+_users = OrderedDict()
+_users_lock = threading.Lock()
+
+
+def user_version(pk):
+    return get_version(USER_VERSION_KEY.format(pk=pk))
+
+
+def invalidate_user(sender=None, instance=None, user=None, **kwargs):
+    """Обработчик post_save, post_delete и user_logged_out."""
+    user = instance or user
+    if user is None or user.pk is None:
+        return
+    with _users_lock:
+        _users.pop(user.pk, None)
+    bump_version(USER_VERSION_KEY.format(pk=user.pk))
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который берёт пользователя сессии из памяти процесса."""
+
+    def get_user(self, user_id):
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return super().get_user(user_id)
+        version = user_version(user_id)
+        with _users_lock:
+            cached = _users.get(user_id)
+            if cached is not None:
+                _users.move_to_end(user_id)
+        if (
+            cached is not None
+            and cached[1] == version
+            and cached[2] > time.monotonic()
+        ):
+            # Копия: изменения в одном запросе не видны в других.
+            return copy.copy(cached[0])
+        user = super().get_user(user_id)
+        if user is not None:
+            with _users_lock:
+                _users[user_id] = (
+                    user, version,
+                    time.monotonic() + settings.AUTH_USER_CACHE_TIMEOUT,
+                )
+                _users.move_to_end(user_id)
+                while len(_users) > settings.AUTH_USER_CACHE_SIZE:
+                    _users.popitem(last=False)
+            user = copy.copy(user)
+        return user
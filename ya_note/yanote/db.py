@@ -0,0 +1,57 @@
+"""Настройка соединений с базой данных и маршрутизация чтений на реплики."""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """
+    Выполняет SQLITE_PRAGMAS для каждого нового соединения с SQLite.
+
+    Подключается к сигналу connection_created. Журнал WAL хранится
+    в самом файле БД, остальные настройки действуют на соединение,
+    поэтому выполняются при каждом подключении.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+# Включается промежуточным слоем ReplicaMiddleware на время запроса.
+use_replicas = ContextVar('use_replicas', default=False)
+# Cookie, с которой клиент после записи читает с основной БД.
+STICKY_COOKIE = 'read_primary'
+
+
+class ReplicaRouter:
+    """
+    Чтения моделей приложения уходят на реплики, когда это разрешено.
+
+    Реплики перечислены в DATABASE_REPLICAS, разрешает чтение с них
+    ReplicaMiddleware для представлений с read_from_replica = True.
+    Сессии и пользователи всегда читаются с основной БД.
+    """
+    route_app_labels = {'notes'}
+
+    def db_for_read(self, model, **hints):
+        if (
+            use_replicas.get()
+            and settings.DATABASE_REPLICAS
+            and model._meta.app_label in self.route_app_labels
+        ):
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Реплики - копии основной БД, связи между ними допустимы."""
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
@@ -0,0 +1,147 @@
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.middleware.gzip import GZipMiddleware
+
+from .db import STICKY_COOKIE, use_replicas
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class QueryStats:
+    """
+    Статистика SQL-запросов, выполненных внутри блока with.
+
+    Считает число запросов, их суммарное время и повторы одного и того же
+    запроса с теми же параметрами по всем подключениям к базам данных.
+    """
+
+    def __init__(self):
+        self.statements = Counter()
+        self.duration = 0.0
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for alias in connections:
+            self._stack.enter_context(
+                connections[alias].execute_wrapper(self)
+            )
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.statements[sql, str(params)] += 1
+
+    @property
+    def count(self):
+        return sum(self.statements.values())
+
+    @property
+    def duplicates(self):
+        return sum(count - 1 for count in self.statements.values())
+
+
+class QueryStatsMiddleware:
+    """В режиме отладки добавляет в ответ заголовки со статистикой SQL."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DEBUG:
+            return self.get_response(request)
+        with QueryStats() as stats:
+            response = self.get_response(request)
+        response['X-Query-Count'] = stats.count
+        response['X-Query-Duration'] = f'{stats.duration * 1000:.2f}ms'
+        response['X-Query-Duplicates'] = stats.duplicates
+        return response
+
+
+class ReplicaMiddleware:
+    """
+    Разрешает чтение с реплик представлениям с read_from_replica = True.
+
+    После изменяющего запроса клиент получает cookie и, пока она
+    не истекла (REPLICA_STICKY_TTL), читает с основной БД и видит
+    свои изменения, даже если реплика отстаёт.
+
+    Представление с методом cache_version кеширует страницу или ETag
+    под версией данных. Пока версия моложе REPLICA_STICKY_TTL, страница
+    читается с основной БД: иначе данные с отстающей реплики остались бы
+    в кеше под новой версией до её следующей смены.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            use_replicas.set(False)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and settings.DATABASE_REPLICAS
+        ):
+            response.set_cookie(
+                STICKY_COOKIE,
+                '1',
+                max_age=settings.REPLICA_STICKY_TTL,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        if (
+            request.method in SAFE_METHODS
+            and getattr(view_class, 'read_from_replica', False)
+            and STICKY_COOKIE not in request.COOKIES
+            and not self.recently_changed(view_class, request, view_kwargs)
+        ):
+            use_replicas.set(True)
+
+    @staticmethod
+    def recently_changed(view_class, request, view_kwargs):
+        """Реплика могла ещё не получить изменение версии страницы."""
+        cache_version = getattr(view_class, 'cache_version', None)
+        if cache_version is None or not settings.DATABASE_REPLICAS:
+            return False
+        version = cache_version(request, **view_kwargs)
+        if version is None:
+            return False
+        age = time.time_ns() - version
+        return age < settings.REPLICA_STICKY_TTL * 10 ** 9
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Сжимает gzip текстовые ответы не короче GZIP_MIN_LENGTH байт.
+
+    Короткие ответы сжатие почти не уменьшает, а уже сжатые данные,
+    например выгрузка с gzip=1, повторно не сжимаются.
+    """
+
+    def process_response(self, request, response):
+        content_type = response.get('Content-Type', '').split(';')[0]
+        if content_type not in settings.GZIP_CONTENT_TYPES:
+            return response
+        if (
+            not response.streaming
+            and len(response.content) < settings.GZIP_MIN_LENGTH
+        ):
+            return response
+        return super().process_response(request, response)
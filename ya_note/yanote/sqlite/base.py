@@ -0,0 +1,19 @@
+"""SQLite, в котором транзакции сразу берут блокировку записи."""
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Транзакции начинаются с BEGIN IMMEDIATE вместо BEGIN.
+
+    Транзакция BEGIN (DEFERRED) сначала только читает, даже если первой
+    выполняется запись: SQLite открывает индексы FTS5, которые обновляют
+    триггеры, ещё при подготовке запроса и читает их настройки. Если
+    после этого чтения записало другое соединение, повысить блокировку
+    до записи уже нельзя, и SQLite сразу отвечает database is locked,
+    не дожидаясь busy_timeout. BEGIN IMMEDIATE ждёт блокировку записи
+    в busy_timeout до первого чтения.
+    """
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN IMMEDIATE')
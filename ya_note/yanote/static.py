@@ -0,0 +1,117 @@
+"""
+Статические файлы для боевого профиля (PRODUCTION).
+
+collectstatic сохраняет файлы с хешем содержимого в имени и рядом
+их сжатые копии .gz. Имя меняется вместе с содержимым, поэтому такие
+файлы можно кешировать в браузере и CDN навсегда.
+"""
+import gzip
+import mimetypes
+import os
+import posixpath
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import (
+    ManifestStaticFilesStorage, staticfiles_storage,
+)
+from django.core.files.base import ContentFile
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.functional import cached_property
+from django.views import static
+
+# Браузер хранит файлы с хешем в имени год и не перепроверяет их.
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+# Файлы без хеша в имени перепроверяются через час.
+MUTABLE_MAX_AGE = 60 * 60
+
+
+def is_compressible(name):
+    content_type, _ = mimetypes.guess_type(name)
+    return content_type in settings.GZIP_CONTENT_TYPES
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage, который заранее сжимает файлы в gzip."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        # Окончательные имена файлов известны только после всех проходов.
+        self.__dict__.pop('hashed_paths', None)
+        for hashed_name in sorted(self.hashed_paths):
+            if is_compressible(hashed_name):
+                self.compress(hashed_name)
+
+    @cached_property
+    def hashed_paths(self):
+        """Имена файлов с хешем из манифеста."""
+        return frozenset(self.hashed_files.values())
+
+    def compress(self, name):
+        with self.open(name) as original:
+            content = original.read()
+        if len(content) < settings.GZIP_MIN_LENGTH:
+            return
+        # mtime=0: одинаковое содержимое всегда даёт одинаковый архив.
+        compressed = gzip.compress(content, compresslevel=9, mtime=0)
+        if len(compressed) >= len(content):
+            return
+        if self.exists(name + '.gz'):
+            self.delete(name + '.gz')
+        self._save(name + '.gz', ContentFile(compressed))
+
+
+def is_hashed(path):
+    """Файл из манифеста collectstatic с хешем в имени."""
+    return path in getattr(staticfiles_storage, 'hashed_paths', ())
+
+
+def accepts_gzip(request):
+    """Клиент принимает gzip: кодировка указана в Accept-Encoding без q=0."""
+    for coding in request.headers.get('Accept-Encoding', '').split(','):
+        name, *params = coding.split(';')
+        if name.strip().lower() != 'gzip':
+            continue
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+def serve(request, path):
+    """
+    Отдаёт собранную статику, если перед Django нет веб-сервера.
+
+    Сжатая копия отдаётся клиентам, которые принимают gzip.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    compressed = path + '.gz'
+    if (
+        accepts_gzip(request)
+        and os.path.isfile(os.path.join(settings.STATIC_ROOT, compressed))
+    ):
+        # Тип файла и Content-Encoding serve определяет по имени .gz,
+        # а имя .gz из Content-Disposition браузеру не нужно.
+        response = static.serve(
+            request, compressed, document_root=settings.STATIC_ROOT
+        )
+        del response['Content-Disposition']
+    else:
+        response = static.serve(
+            request, path, document_root=settings.STATIC_ROOT
+        )
+    if is_compressible(path):
+        patch_vary_headers(response, ('Accept-Encoding',))
+    if is_hashed(path):
+        patch_cache_control(
+            response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True
+        )
+    else:
+        patch_cache_control(response, public=True, max_age=MUTABLE_MAX_AGE)
+    return response
@@ -1,9 +1,12 @@
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth import views as auth_views
 from django.contrib.auth.forms import UserCreationForm
-from django.urls import include, path
+from django.urls import include, path, re_path
 from django.views.generic import CreateView
 
+from yanote import static
+
 urlpatterns = [
     path('', include('notes.urls')),
     path('admin/', admin.site.urls),
@@ -34,3 +37,12 @@ auth_urls = ([
 ], 'users')
 
 urlpatterns += [path('auth/', include(auth_urls))]
+
+if settings.PRODUCTION:
+    # Собранная статика, если перед Django нет веб-сервера.
+    urlpatterns += [
+        re_path(
+            r'^{}(?P<path>.+)$'.format(settings.STATIC_URL.lstrip('/')),
+            static.serve,
+        ),
+    ]